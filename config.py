@@ -5,6 +5,7 @@
 import os
 import sys
 from datetime import datetime
+from functools import lru_cache
 
 # =====================================================
 # ファイルパス設定
@@ -49,6 +50,7 @@ class WindowConfig:
     MIN_WIDTH = 1200
     MIN_HEIGHT = 800
     RESIZABLE = (True, True)
+    MONTH_SWITCH_DELAY_MS = 40  # 前月/翌月の連続操作をまとめて再描画するまでの待ち時間
 
 # =====================================================
 # カラーテーマ設定
@@ -103,6 +105,8 @@ class TreeviewConfig:
     
     # その他
     ROW_HEIGHT = 27              # 行の高さ
+    EMPTY_CELL = ""              # 空セルの表示値(余白は列のanchorで表現)
+    TOOLTIP_DELAY_MS = 150       # マウスが止まってからツールチップを表示するまでの待ち時間
 
 # =====================================================
 # デフォルトの支出項目
@@ -195,12 +199,23 @@ def parse_amount(amount_str):
     """
     金額文字列を整数に変換する
     
+    同じ金額文字列が繰り返し集計されるため、文字列の場合は結果をキャッシュする。
+    貼り付けたJSONや古いデータファイルからはリストなどハッシュできない値も
+    渡されるため、それ以外はキャッシュを通さずに変換する。
+    
     Args:
         amount_str: 金額を表す文字列
         
     Returns:
         int: パースされた金額(失敗時は0)
     """
+    if isinstance(amount_str, str):
+        return _parse_amount_cached(amount_str)
+    return _parse_amount(amount_str)
+
+
+def _parse_amount(amount_str):
+    """parse_amountの変換処理本体（キャッシュなし）"""
     if not amount_str:
         return 0
     try:
@@ -208,3 +223,7 @@ def parse_amount(amount_str):
         return int(clean_amount) if clean_amount else 0
     except ValueError:
         return 0
+
+
+# 文字列の金額用のキャッシュ付き変換
+_parse_amount_cached = lru_cache(maxsize=1024)(_parse_amount)
@@ -8,7 +8,6 @@ from tkinter import messagebox
 import socket
 import sys
 from ui.main_window import MainWindow
-from utils.font_utils import setup_japanese_font
 
 def check_single_instance():
     """
@@ -40,9 +39,6 @@ def main():
         root.destroy()
         sys.exit(0)
 
-    # 日本語フォントを設定
-    setup_japanese_font()
-    
     try:
         # Tkinterのルートウィンドウを作成
         root = tk.Tk()
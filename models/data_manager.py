@@ -6,6 +6,9 @@
 import json
 import os
 import shutil
+import threading
+
+from config import parse_amount
 
 
 class DataManager:
@@ -13,7 +16,14 @@ class DataManager:
     
     def __init__(self):
         """データマネージャーの初期化"""
-        self.data = {}  # 詳細データを格納する辞書 {key: [[partner, amount, detail], ...]}
+        self.data = {}  # 詳細データを格納する辞書 {(年, 月, 日, 列): [[partner, amount, detail], ...]}
+        self._json_cache = {}  # 取引データのJSON文字列キャッシュ {(年, 月, 日, 列): json_str}
+        self._amount_cache = {}  # 取引データの金額合計キャッシュ {(年, 月, 日, 列): int}
+        self._search_cache = {}  # 整形済みの行のキャッシュ {(年, 月, 日, 列): [(支払先, 金額, 詳細, 小文字の検索対象, 金額の数値), ...]}
+        self._month_index = {}  # 年月ごとのキーの索引 {(年, 月): {(年, 月, 日, 列), ...}}
+        self._column_index = {}  # 年月・列ごとのデータがある日の索引 {(年, 月, 列): {日, ...}}
+        self.version = 0  # 取引データの変更回数（画面側の集計キャッシュの無効化に使用）
+        self._io_lock = threading.Lock()  # 月別ファイル・設定ファイルへの書き込みを直列化
         self.custom_columns = []  # カスタム項目リスト
         self.transaction_partners = set()  # 支払先の履歴
         
@@ -77,6 +87,18 @@ class DataManager:
             pass
         return None
     
+    def _format_key(self, key):
+        """
+        タプルキーを "年-月-日-列" 形式の文字列に変換（旧フォーマット出力用）
+        
+        Args:
+            key: (year, month, day, col_index) のタプル
+            
+        Returns:
+            str: "年-月-日-列" 形式のキー
+        """
+        return "{}-{}-{}-{}".format(*key)
+    
     def _convert_old_to_new_format(self, old_data):
         """
         旧フォーマットのデータを新フォーマットに変換
@@ -130,17 +152,23 @@ class DataManager:
             new_data: 新フォーマットのデータ
             
         Returns:
-            dict: 旧フォーマットのデータ
+            dict: 旧フォーマットのデータ {(年, 月, 日, 列): [...]}
         """
         old_format = {}
         
         for day_key, transactions in new_data.items():
+            try:
+                day = int(day_key)
+            except ValueError:
+                continue
+            
             # 日付ごとに列ごとにグループ化
             col_groups = {}
             
             for transaction in transactions:
-                col_index = transaction.get("列目", "")
-                if not col_index:
+                try:
+                    col_index = int(transaction.get("列目", ""))
+                except (ValueError, TypeError):
                     continue
                 
                 if col_index not in col_groups:
@@ -152,10 +180,9 @@ class DataManager:
                     transaction.get("詳細", "")
                 ])
             
-            # 旧フォーマットのキーで格納
+            # タプルキーで格納
             for col_index, trans_list in col_groups.items():
-                old_key = f"{year}-{month}-{day_key}-{col_index}"
-                old_format[old_key] = trans_list
+                old_format[(year, month, day, col_index)] = trans_list
         
         return old_format
     
@@ -167,6 +194,10 @@ class DataManager:
         3. data_1.jsonがあれば読み込み
         """
         self.data = {}
+        self._json_cache = {}
+        self._amount_cache = {}
+        self._search_cache = {}
+        self.version += 1
         
         # 新フォーマットのデータを読み込み
         self._load_new_format_data()
@@ -178,6 +209,12 @@ class DataManager:
         # data_1.jsonからも読み込み
         if os.path.exists(self.DATA_FILE_OLD):
             self._load_old_backup_data()
+        
+        # 読み込み完了後に年月ごと・列ごとの索引を作成
+        self._month_index = {}
+        self._column_index = {}
+        for key in self.data:
+            self._add_to_index(key)
     
     def _load_new_format_data(self):
         """新フォーマットのデータを読み込み"""
@@ -286,7 +323,10 @@ class DataManager:
                 data_dict = old_data.get("data", {})
             
             # 既存データとマージ(既存優先) + 支払先の抽出を同時に実行
-            for key, value in data_dict.items():
+            for str_key, value in data_dict.items():
+                key = self._parse_key(str_key)
+                if key is None:
+                    continue
                 if key not in self.data:
                     self.data[key] = value
                     
@@ -307,34 +347,36 @@ class DataManager:
             month: 月
             month_data: 保存するデータ {day: [transactions]}
         """
-        data_file = self._get_data_file_path(year, month)
-        
-        # 既存データがあれば読み込んでマージ
-        existing_data = {}
-        if os.path.exists(data_file):
+        # 終了時のバックグラウンド保存と競合しないよう排他制御
+        with self._io_lock:
+            data_file = self._get_data_file_path(year, month)
+            
+            # 既存データがあれば読み込んでマージ
+            existing_data = {}
+            if os.path.exists(data_file):
+                try:
+                    with open(data_file, "r", encoding="utf-8") as f:
+                        file_content = json.load(f)
+                        existing_data = file_content.get("data", {})
+                except:
+                    pass
+            
+            # データをマージ
+            existing_data.update(month_data)
+            
+            # 保存
+            save_data = {
+                "version": self.APP_VERSION,
+                "year": year,
+                "month": month,
+                "data": existing_data
+            }
+            
             try:
-                with open(data_file, "r", encoding="utf-8") as f:
-                    file_content = json.load(f)
-                    existing_data = file_content.get("data", {})
-            except:
-                pass
-        
-        # データをマージ
-        existing_data.update(month_data)
-        
-        # 保存
-        save_data = {
-            "version": self.APP_VERSION,
-            "year": year,
-            "month": month,
-            "data": existing_data
-        }
-        
-        try:
-            with open(data_file, "w", encoding="utf-8") as f:
-                json.dump(save_data, f, ensure_ascii=False, indent=2)
-        except Exception as e:
-            print(f"データ保存エラー ({year}/{month}): {e}")
+                with open(data_file, "w", encoding="utf-8") as f:
+                    json.dump(save_data, f, ensure_ascii=False, indent=2)
+            except Exception as e:
+                print(f"データ保存エラー ({year}/{month}): {e}")
     
     def save_data(self):
         """全データを保存"""
@@ -372,7 +414,7 @@ class DataManager:
         backup_file = os.path.join(date_dir, f"data_{now.strftime('%H%M%S')}.json")
         backup_data = {
             "version": self.APP_VERSION,
-            "data": self.data
+            "data": {self._format_key(key): value for key, value in self.data.items()}
         }
         
         try:
@@ -419,12 +461,7 @@ class DataManager:
         # 年月ごとにグループ化
         year_month_data = {}
         
-        for key, transactions in self.data.items():
-            parsed = self._parse_key(key)
-            if not parsed:
-                continue
-            
-            year, month, day, col_index = parsed
+        for (year, month, day, col_index), transactions in self.data.items():
             year_month_key = (year, month)
             
             if year_month_key not in year_month_data:
@@ -454,13 +491,9 @@ class DataManager:
         特定の取引データを即座に保存
         
         Args:
-            dict_key: データのキー(年-月-日-列インデックス)
+            dict_key: データのキー(年, 月, 日, 列インデックス)
         """
-        parsed = self._parse_key(dict_key)
-        if not parsed:
-            return
-        
-        year, month, day, col_index = parsed
+        year, month, day, col_index = dict_key
         
         # この年月の全データを収集
         month_data = {}
@@ -507,40 +540,146 @@ class DataManager:
             "transaction_partners": list(self.transaction_partners)
         }
         try:
-            with open(self.SETTINGS_FILE, "w", encoding="utf-8") as f:
+            with self._io_lock, open(self.SETTINGS_FILE, "w", encoding="utf-8") as f:
                 json.dump(settings, f, ensure_ascii=False, indent=2)
         except Exception as e:
             print(f"設定保存エラー: {e}")
     
     def get_transaction_data(self, dict_key):
-        """指定されたキーの取引データを取得"""
-        return self.data.get(dict_key, [])
+        """
+        指定されたキー(年, 月, 日, 列インデックス)の取引データを取得
+        
+        保存済みのデータはその場で変更せず、常にset_transaction_dataで
+        置き換えるため、呼び出し側はコピーせずに参照を保持してよい
+        （元に戻すスタックもこの参照をそのまま保存する）。
+        """
+        return self.data.get(dict_key, ())
+    
+    def get_month_keys(self, year, month):
+        """
+        指定された年月の取引データのキーを取得する
+        
+        全データを走査せずに済むよう、年月ごとの索引から返す。
+        
+        Args:
+            year: 年
+            month: 月
+            
+        Returns:
+            set: (年, 月, 日, 列インデックス)のキーの集合(変更しないこと)
+        """
+        return self._month_index.get((year, month), set())
+    
+    def get_column_days(self, year, month, col_index):
+        """
+        指定された年月・列でデータがある日を取得する
+        
+        Args:
+            year: 年
+            month: 月
+            col_index: 列インデックス
+            
+        Returns:
+            set: 日の集合(まとめ行の0を含む。変更しないこと)
+        """
+        return self._column_index.get((year, month, col_index), set())
+    
+    def _add_to_index(self, dict_key):
+        """キーを年月ごと・列ごとの索引に登録する"""
+        self._month_index.setdefault(dict_key[:2], set()).add(dict_key)
+        year, month, day, col_index = dict_key
+        self._column_index.setdefault((year, month, col_index), set()).add(day)
+    
+    def _remove_from_index(self, dict_key):
+        """キーを年月ごと・列ごとの索引から削除する"""
+        self._month_index.get(dict_key[:2], set()).discard(dict_key)
+        year, month, day, col_index = dict_key
+        self._column_index.get((year, month, col_index), set()).discard(day)
+    
+    def get_transaction_json(self, dict_key):
+        """
+        指定されたキーの取引データをJSON文字列で取得する
+        
+        同じセルを繰り返しコピーする場合に再シリアライズしないよう、
+        結果をキャッシュする（データ変更時に破棄）。
+        
+        Args:
+            dict_key: データのキー(年, 月, 日, 列インデックス)
+            
+        Returns:
+            str: 取引データのJSON文字列(データがない場合は"[]")
+        """
+        json_str = self._json_cache.get(dict_key)
+        if json_str is None:
+            json_str = json.dumps(self.data.get(dict_key, []), ensure_ascii=False,
+                                  separators=(',', ':'))
+            self._json_cache[dict_key] = json_str
+        return json_str
+    
+    def get_amount_total(self, dict_key):
+        """
+        指定されたキーの取引データの金額合計を取得する
+        
+        画面の再描画のたびに金額文字列を解析し直さないよう、
+        結果をキャッシュする（データ変更時に破棄）。
+        
+        Args:
+            dict_key: データのキー(年, 月, 日, 列インデックス)
+            
+        Returns:
+            int: 金額の合計(データがない場合は0)
+        """
+        total = self._amount_cache.get(dict_key)
+        if total is None:
+            total = sum(parse_amount(row[1]) for row in self.data.get(dict_key, ()) if len(row) > 1)
+            self._amount_cache[dict_key] = total
+        return total
     
     def set_transaction_data(self, dict_key, data_list):
         """
         指定されたキーに取引データを設定し、即座に保存
         
         Args:
-            dict_key: データのキー(年-月-日-列インデックス)
+            dict_key: データのキー(年, 月, 日, 列インデックス)
             data_list: 設定する取引データのリスト
+            
+        Returns:
+            int: 設定したデータの金額合計（セル表示用。キャッシュにも保持する）
         """
         if data_list:
-            self.data[dict_key] = data_list
-        elif dict_key in self.data:
-            del self.data[dict_key]
+            # 参照を共有しても安全なようにタプルで保持する
+            self.data[dict_key] = data_list = tuple(data_list)
+            self._add_to_index(dict_key)
+            total = sum(parse_amount(row[1]) for row in data_list if len(row) > 1)
+            self._amount_cache[dict_key] = total
+        else:
+            if dict_key in self.data:
+                del self.data[dict_key]
+            self._remove_from_index(dict_key)
+            total = 0
+            self._amount_cache.pop(dict_key, None)
+        self._json_cache.pop(dict_key, None)
+        self._search_cache.pop(dict_key, None)
+        self.version += 1
         
         # 即座に保存
         self.auto_save_transaction(dict_key)
+        return total
     
     def delete_transaction_data(self, dict_key):
         """
         指定されたキーの取引データを削除し、即座に保存
         
         Args:
-            dict_key: データのキー
+            dict_key: データのキー(年, 月, 日, 列インデックス)
         """
         if dict_key in self.data:
             del self.data[dict_key]
+        self._remove_from_index(dict_key)
+        self._json_cache.pop(dict_key, None)
+        self._amount_cache.pop(dict_key, None)
+        self._search_cache.pop(dict_key, None)
+        self.version += 1
         
         # 即座に保存
         self.auto_save_transaction(dict_key)
@@ -583,72 +722,106 @@ class DataManager:
     
     def delete_column_data(self, col_index):
         """指定された列の全データを削除"""
-        keys_to_delete = [key for key in self.data.keys()
-                          if key.split("-")[3] == str(col_index)]
+        keys_to_delete = [key for key in self.data.keys() if key[3] == col_index]
         
         # 削除対象を年月でグループ化
         year_month_set = set()
         for key in keys_to_delete:
-            parsed = self._parse_key(key)
-            if parsed:
-                year, month, _, _ = parsed
-                year_month_set.add((year, month))
+            year_month_set.add((key[0], key[1]))
             del self.data[key]
+            self._remove_from_index(key)
+            self._json_cache.pop(key, None)
+            self._amount_cache.pop(key, None)
+            self._search_cache.pop(key, None)
+        self.version += 1
         
         # 影響を受けた年月のデータを保存
         for year, month in year_month_set:
             month_data = {}
-            for key, transactions in self.data.items():
-                parsed = self._parse_key(key)
-                if parsed and parsed[0] == year and parsed[1] == month:
-                    day, col_idx = parsed[2], parsed[3]
-                    day_key = str(day)
-                    
-                    if day_key not in month_data:
-                        month_data[day_key] = []
-                    
-                    for transaction in transactions:
-                        if len(transaction) >= 3:
-                            new_transaction = {
-                                "列目": str(col_idx),
-                                "支払先": str(transaction[0]) if transaction[0] else "",
-                                "金額": str(transaction[1]) if transaction[1] else "",
-                                "詳細": str(transaction[2]) if transaction[2] else ""
-                            }
-                            month_data[day_key].append(new_transaction)
+            for key in self.get_month_keys(year, month):
+                day, col_idx = key[2], key[3]
+                transactions = self.data[key]
+                day_key = str(day)
+                
+                if day_key not in month_data:
+                    month_data[day_key] = []
+                
+                for transaction in transactions:
+                    if len(transaction) >= 3:
+                        new_transaction = {
+                            "列目": str(col_idx),
+                            "支払先": str(transaction[0]) if transaction[0] else "",
+                            "金額": str(transaction[1]) if transaction[1] else "",
+                            "詳細": str(transaction[2]) if transaction[2] else ""
+                        }
+                        month_data[day_key].append(new_transaction)
             
             self._save_month_data(year, month, month_data)
     
+    def get_normalized_rows(self, dict_key):
+        """
+        表示・検索用に整形した行を取得する
+        
+        文字列の整形・小文字化と金額の解析を検索やツールチップ表示のたびに
+        繰り返さないよう、結果をキャッシュする（データ変更時に破棄）。
+        保存形式（文字列のリスト）はそのまま残す。
+        
+        Args:
+            dict_key: データのキー(年, 月, 日, 列インデックス)
+            
+        Returns:
+            list: [(支払先, 金額, 詳細, 小文字化した検索対象文字列, 金額の数値), ...]
+                (3列未満の行は含まない。変更しないこと)
+        """
+        rows = self._search_cache.get(dict_key)
+        if rows is None:
+            rows = []
+            for row in self.data.get(dict_key, ()):
+                if len(row) >= 3:
+                    partner = str(row[0]).strip() if row[0] else ""
+                    amount = str(row[1]).strip() if row[1] else ""
+                    detail = str(row[2]).strip() if row[2] else ""
+                    # 項目をまたいで一致しないよう区切り文字を挟んで連結
+                    haystack = "\0".join((partner, amount, detail)).lower()
+                    rows.append((partner, amount, detail, haystack, parse_amount(amount)))
+            self._search_cache[dict_key] = rows
+        return rows
+    
     def search_transactions(self, search_text):
-        """取引データを検索"""
+        """
+        取引データを検索
+        
+        Args:
+            search_text: 検索文字列(支払先・金額・詳細のいずれかに部分一致、大文字小文字を区別しない)
+            
+        Returns:
+            list: 一致した取引の辞書のリスト(金額は数値化した'amount_value'も含む)。
+                (年, 月, 日, 列インデックス)の順に並べて返す。
+        """
         results = []
         search_text_lower = search_text.lower()
-        
-        for dict_key, data_list in self.data.items():
-            try:
-                parts = dict_key.split("-")
-                if len(parts) == 4:
-                    year, month, day, col_index = map(int, parts)
-                    
-                    for row in data_list:
-                        if len(row) >= 3:
-                            partner = str(row[0]).strip() if row[0] else ""
-                            amount = str(row[1]).strip() if row[1] else ""
-                            detail = str(row[2]).strip() if row[2] else ""
-                            
-                            if (search_text_lower in partner.lower() or
-                                search_text_lower in amount.lower() or
-                                search_text_lower in detail.lower()):
-                                results.append({
-                                    'year': year,
-                                    'month': month,
-                                    'day': day,
-                                    'col_index': col_index,
-                                    'partner': partner,
-                                    'amount': amount,
-                                    'detail': detail
-                                })
-            except (ValueError, IndexError):
-                continue
+        get_rows = self.get_normalized_rows
+        
+        # 一致した行を含むキーだけを集め、それらのキーのみをソートする
+        matched_keys = [
+            dict_key for dict_key in self.data
+            if any(search_text_lower in row[3] for row in get_rows(dict_key))
+        ]
+        matched_keys.sort()
+        
+        for dict_key in matched_keys:
+            year, month, day, col_index = dict_key
+            for partner, amount, detail, haystack, amount_value in get_rows(dict_key):
+                if search_text_lower in haystack:
+                    results.append({
+                        'year': year,
+                        'month': month,
+                        'day': day,
+                        'col_index': col_index,
+                        'partner': partner,
+                        'amount': amount,
+                        'detail': detail,
+                        'amount_value': amount_value
+                    })
         
         return results
\ No newline at end of file
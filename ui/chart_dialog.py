@@ -3,10 +3,16 @@
 項目別の月間推移グラフを表示するダイアログ
 """
 import tkinter as tk
+import warnings
 from tkinter import ttk
-import matplotlib.pyplot as plt
-import matplotlib.dates as mdates
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+
+# matplotlibのフォント警告はフォントキャッシュを作成するインポート時に出るため、
+# インポートの間だけ抑制する
+with warnings.catch_warnings():
+    warnings.filterwarnings('ignore', category=UserWarning, module='matplotlib.font_manager')
+    import matplotlib.pyplot as plt
+    import matplotlib.dates as mdates
+    from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 from datetime import date
 from ui.base_dialog import BaseDialog
 from config import DialogConfig, parse_amount
@@ -45,12 +51,8 @@ class ChartDialog(BaseDialog):
         """
         years = {self.parent_app.current_year}
         for dict_key in self.parent_app.data_manager.data.keys():
-            try:
-                # key形式: "YYYY-MM-DD-COL"
-                y = int(dict_key.split("-")[0])
-                years.add(y)
-            except (ValueError, IndexError):
-                pass
+            # key形式: (年, 月, 日, 列)
+            years.add(dict_key[0])
         return sorted(list(years), reverse=True)
 
     def _create_widgets(self):
@@ -290,27 +292,23 @@ class ChartDialog(BaseDialog):
         
         for dict_key, data_list in self.parent_app.data_manager.data.items():
             try:
-                parts = dict_key.split("-")
-                if len(parts) == 4:
-                    year = int(parts[0])
-                    month = int(parts[1])
-                    day = int(parts[2])
-                    
-                    # 年フィルタリング
-                    if year != self.target_year:
-                        continue
-                    
-                    if day == 0:
-                        continue
-                    
-                    month_key = date(year, month, 1)
-                    if month_key not in monthly_totals:
-                        monthly_totals[month_key] = 0
-                    
-                    for row in data_list:
-                        if len(row) > 1:
-                            amount = parse_amount(row[1])
-                            monthly_totals[month_key] += amount
+                year, month, day, _ = dict_key
+                
+                # 年フィルタリング
+                if year != self.target_year:
+                    continue
+                
+                if day == 0:
+                    continue
+                
+                month_key = date(year, month, 1)
+                if month_key not in monthly_totals:
+                    monthly_totals[month_key] = 0
+                
+                for row in data_list:
+                    if len(row) > 1:
+                        amount = parse_amount(row[1])
+                        monthly_totals[month_key] += amount
             except (ValueError, IndexError):
                 continue
         
@@ -322,23 +320,18 @@ class ChartDialog(BaseDialog):
         
         for dict_key, data_list in self.parent_app.data_manager.data.items():
             try:
-                parts = dict_key.split("-")
-                if len(parts) == 4:
-                    year = int(parts[0])
-                    month = int(parts[1])
-                    day = int(parts[2])
-                    col_index = int(parts[3])
-                    
-                    # 年フィルタリング
-                    if year != self.target_year:
-                        continue
-                    
-                    # まとめ行の収入列のみ対象
-                    if day == 0 and col_index == 3:
-                        month_key = date(year, month, 1)
-                        total_income = sum(parse_amount(row[1]) for row in data_list if len(row) > 1)
-                        if total_income > 0:
-                            monthly_totals[month_key] = total_income
+                year, month, day, col_index = dict_key
+                
+                # 年フィルタリング
+                if year != self.target_year:
+                    continue
+                
+                # まとめ行の収入列のみ対象
+                if day == 0 and col_index == 3:
+                    month_key = date(year, month, 1)
+                    total_income = sum(parse_amount(row[1]) for row in data_list if len(row) > 1)
+                    if total_income > 0:
+                        monthly_totals[month_key] = total_income
             except (ValueError, IndexError):
                 continue
         
@@ -350,29 +343,24 @@ class ChartDialog(BaseDialog):
         
         for dict_key, data_list in self.parent_app.data_manager.data.items():
             try:
-                parts = dict_key.split("-")
-                if len(parts) == 4:
-                    year = int(parts[0])
-                    month = int(parts[1])
-                    day = int(parts[2])
-                    col_index = int(parts[3])
-                    
-                    # 年フィルタリング
-                    if year != self.target_year:
-                        continue
-                    
-                    if day == 0:
-                        continue
+                year, month, day, col_index = dict_key
+                
+                # 年フィルタリング
+                if year != self.target_year:
+                    continue
+                
+                if day == 0:
+                    continue
+                
+                if col_index == self.current_column_index:
+                    month_key = date(year, month, 1)
+                    if month_key not in monthly_totals:
+                        monthly_totals[month_key] = 0
                     
-                    if col_index == self.current_column_index:
-                        month_key = date(year, month, 1)
-                        if month_key not in monthly_totals:
-                            monthly_totals[month_key] = 0
-                        
-                        for row in data_list:
-                            if len(row) > 1:
-                                amount = parse_amount(row[1])
-                                monthly_totals[month_key] += amount
+                    for row in data_list:
+                        if len(row) > 1:
+                            amount = parse_amount(row[1])
+                            monthly_totals[month_key] += amount
             except (ValueError, IndexError):
                 continue
         
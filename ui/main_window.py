@@ -14,12 +14,10 @@ from config import (
 from models.data_manager import DataManager
 from ui.tooltip import TreeviewTooltip
 from ui.transaction_dialog import TransactionDialog
-from ui.monthly_data_dialog import MonthlyDataDialog
-from ui.search_dialog import SearchDialog
-from ui.chart_dialog import ChartDialog
-from utils.date_utils import get_days_in_month
+from utils.date_utils import get_days_in_month, WEEKDAY_NAMES
 import datetime
-import re
+import threading
+from collections import deque
 
 
 class MainWindow:
@@ -30,6 +28,9 @@ class MainWindow:
     記録・集計・分析する機能を提供する。
     """
     
+    # デフォルト列の数（これ以降のインデックスがカスタム列）
+    _n_default_columns = len(DefaultColumns.ITEMS)
+    
     def __init__(self, root):
         """
         メインウィンドウを初期化する。
@@ -41,23 +42,64 @@ class MainWindow:
         self.data_manager = DataManager()
         self.tree = None
         self.tooltip = None
+        
+        # 表示中の行IDキャッシュ（_show_monthで更新）
+        self._row_ids = ()
+        self._row_pos = {}  # {行ID: 表示位置}（items.indexの線形探索を避ける）
+        self._total_row_id = None
+        self._summary_row_id = None
+        self._day_to_row_id = {}  # {日: 行ID}
+        self._row_to_day = {}  # {行ID: 日}（行の表示から日付を読み戻さずに済むように）
+        self._day_row_pool = []  # 日付行の行IDプール（月の切り替え時に再利用）
+        self._attached_day_rows = 0  # プールのうち表示中（detachされていない）の行数
+        self._col_sums = []  # 日付行の列ごとの合計（_show_monthで集計し、セル更新時は差分で更新）
+        self._income_total = 0  # 表示中の月の収入合計
+        
+        # 全列リストのキャッシュ（列の追加・編集・削除時に無効化）
+        self._all_columns_cache = None
+        self._title_width_cache = {}  # {列名: タイトル幅(px)}（Treeview再作成時も保持）
+        
+        # 日ごとの合計のキャッシュ（DataManager.versionが変わったら破棄）
+        self._day_totals_cache = {}  # {(年, 月, 日, 列数): 日の合計リスト}
+        self._day_totals_version = None
+        
+        # 合計再計算の予約フラグ（複数セル更新時に1回にまとめる）
+        self._totals_dirty = False
+        self._bulk_rows = None  # 一括更新中の行の値 {行ID: [値, ...]}（一括更新中以外はNone）
+        self._rebuild_pending = False  # Treeview再作成の予約フラグ
+        self._pending_redraw = None  # 前月/翌月移動の再描画予約ID
+        self._pending_month = None  # 予約中の移動先 (年, 月)
+        self._closing_thread = None  # 終了時の保存スレッド
+        # 列名編集ダイアログ（初回に生成し、以降は表示/非表示を切り替えて再利用）
+        self._rename_dialog = None
+        self._rename_entry = None
+        self._rename_target = None  # (列インデックス, 変更前の列名)
         self.current_year = get_current_year()
         self.current_month = get_current_month()
         self.colors = self._get_color_theme()
 
-        # コピペ用：選択された列のIDを保持
-        self.selected_column_id = None
+        # コピペ用：選択された列のインデックス（0始まり）を保持
+        # （列ID "#N" はイベント受付時に一度だけ変換し、内部では整数で扱う）
+        self.selected_column_idx = None
         
         # 範囲選択用
         self.selection_start_row = None  # 範囲選択の開始行
-        self.selection_start_col = None  # 範囲選択の開始列
+        self.selection_start_col = None  # 範囲選択の開始列（列インデックス）
+        
+        # Ctrl選択用：個別に選択されたセル {(row_id, col_idx), ...}
+        self.ctrl_selected_cells = set()
         
-        # Ctrl選択用：個別に選択されたセル [(row_id, col_id), ...]
-        self.ctrl_selected_cells = []
+        # 修飾キー(Shift=0x1, Ctrl=0x4)ごとのクリック処理
+        self._click_dispatch = {
+            0x1: self._handle_shift_click,
+            0x4: self._handle_ctrl_click,
+            0x5: lambda row_id, col_idx: (self._handle_shift_click(row_id, col_idx)
+                                          or self._handle_ctrl_click(row_id, col_idx)),
+        }
         
         # 元に戻す機能用
-        self.undo_stack = []  # 操作履歴 [(action_type, data), ...]
         self.max_undo_count = 50  # 最大保持数
+        self.undo_stack = deque(maxlen=self.max_undo_count)  # 操作履歴（超過分は古いものから自動削除）
         
         # 月選択ボタンのリスト
         self.month_buttons = []
@@ -74,7 +116,7 @@ class MainWindow:
         self.root.protocol("WM_DELETE_WINDOW", self._on_closing)
         
         # グローバルキーボードショートカット
-        self.root.bind('<Control-f>', lambda e: SearchDialog(self.root, self))
+        self.root.bind('<Control-f>', lambda e: self._open_search())
 
         # コピー＆ペーストのショートカット
         self.root.bind('<Control-c>', self._copy_cells)
@@ -182,6 +224,25 @@ class MainWindow:
         style.map('Nav.TButton',
                   background=[('active', self.colors['accent']),
                               ('pressed', self.colors['hover'])])
+        
+        # Treeviewスタイル（Treeview再作成時に再設定しないようここで1回だけ設定）
+        style.configure("Treeview",
+                        fieldbackground="white",
+                        background="white",
+                        rowheight=TreeviewConfig.ROW_HEIGHT,
+                        font=FontConfig.DEFAULT,
+                        borderwidth=1,
+                        relief="solid")
+        
+        style.configure("Treeview.Heading",
+                        background="#e8e8e8",
+                        font=FontConfig.HEADING,
+                        relief="raised",
+                        borderwidth=1)
+        
+        style.map("Treeview",
+                  background=[('selected', '#0078d4')],
+                  foreground=[('selected', 'yellow')])
     
     def _load_data(self):
         """データと設定を読み込む"""
@@ -194,10 +255,30 @@ class MainWindow:
         self.data_manager.save_settings()
     
     def _on_closing(self):
-        """ウィンドウが閉じられる時の処理"""
+        """
+        ウィンドウが閉じられる時の処理
+        
+        ウィンドウはすぐに隠し、保存とバックアップはバックグラウンドで行う。
+        保存完了後にメインスレッドでウィンドウを破棄する。
+        """
+        if self._closing_thread is not None:
+            return
+        self.root.withdraw()
+        self._closing_thread = threading.Thread(target=self._save_on_close, daemon=False)
+        self._closing_thread.start()
+        self._wait_for_close_save()
+    
+    def _save_on_close(self):
+        """終了時の保存処理（バックグラウンドスレッドで実行）"""
         self._save_data()
         self.data_manager.save_backup()
-        self.root.destroy()
+    
+    def _wait_for_close_save(self):
+        """終了時の保存完了を待ってウィンドウを破棄する"""
+        if self._closing_thread.is_alive():
+            self.root.after(50, self._wait_for_close_save)
+        else:
+            self.root.destroy()
     
     def _create_ui(self):
         """メインウィンドウのUI要素を作成する"""
@@ -232,8 +313,40 @@ class MainWindow:
         tree_section.pack(fill=tk.BOTH, expand=True)
         
         self._create_treeview(tree_section)
+        self._create_context_menus()
         self._update_month_buttons()
     
+    def _create_context_menus(self):
+        """
+        右クリックメニューを作成する
+        
+        クリックのたびにMenuウィジェットを生成しないよう、
+        セル用・カスタム列用・既定列用のメニューを一度だけ作成して使い回す。
+        """
+        # セル用メニュー
+        self.cell_context_menu = tk.Menu(self.root, tearoff=0)
+        self.cell_context_menu.add_command(label="元に戻す (Ctrl+Z)", command=self._undo)
+        self.cell_context_menu.add_separator()
+        self.cell_context_menu.add_command(label="切り取り (Ctrl+X)", command=self._cut_cells)
+        self.cell_context_menu.add_command(label="コピー (Ctrl+C)", command=self._copy_cells)
+        self.cell_context_menu.add_command(label="貼り付け (Ctrl+V)", command=self._paste_cells)
+        self.cell_context_menu.add_separator()
+        self.cell_context_menu.add_command(label="削除 (Delete)", command=self._delete_cells)
+        
+        # カスタム列用メニュー(編集・削除オプションあり)
+        self.custom_column_menu = tk.Menu(self.root, tearoff=0)
+        self.custom_column_menu.add_command(label="列名を編集", command=self._edit_column_name)
+        self.custom_column_menu.add_separator()
+        self.custom_column_menu.add_command(label="列を削除", command=self._delete_column)
+        self.custom_column_menu.add_separator()
+        self.custom_column_menu.add_command(label="全ての列幅をリセット",
+                                            command=self._reset_all_column_widths)
+        
+        # 既定列用メニュー(すべての列で列幅リセットを利用可能)
+        self.column_context_menu = tk.Menu(self.root, tearoff=0)
+        self.column_context_menu.add_command(label="全ての列幅をリセット",
+                                             command=self._reset_all_column_widths)
+    
     def _create_year_controls(self, parent):
         """年選択コントロールを作成"""
         year_container = tk.Frame(parent, bg=self.colors['bg_secondary'])
@@ -276,8 +389,10 @@ class MainWindow:
         for m in range(1, 13):
             btn = ttk.Button(month_container, text=f"{m:02d}", width=4, style='Modern.TButton',
                              command=lambda mo=m: self.select_month(mo))
-            btn.pack(side=tk.LEFT, padx=1)
             self.month_buttons.append(btn)
+        
+        # 12個のボタンを1回のpackコマンドでまとめて配置
+        self.root.tk.call("pack", *self.month_buttons, "-side", tk.LEFT, "-padx", 1)
     
     def _create_search_button(self, parent):
         """検索ボタンを作成"""
@@ -285,7 +400,7 @@ class MainWindow:
         search_container.pack(side=tk.LEFT, padx=(20, 0))
         
         ttk.Button(search_container, text="🔍 検索 (Ctrl+F)", width=15, style='Accent.TButton',
-                   command=lambda: SearchDialog(self.root, self)).pack()
+                   command=self._open_search).pack()
     
     def _create_chart_button(self, parent):
         """図表ボタンを作成"""
@@ -293,7 +408,7 @@ class MainWindow:
         chart_container.pack(side=tk.LEFT, padx=(10, 0))
         
         ttk.Button(chart_container, text="📊 図表", width=10, style='Accent.TButton',
-                   command=lambda: ChartDialog(self.root, self)).pack()
+                   command=self._open_chart).pack()
     
     def _create_current_month_button(self, parent):
         """現在月表示ボタンを作成"""
@@ -330,9 +445,10 @@ class MainWindow:
         self.tree = ttk.Treeview(tree_frame, columns=columns_with_button, show="headings", height=25)
         self.tree.grid(row=0, column=0, sticky="nsew")
 
-        # ヘッダーフォントの計測用オブジェクトを作成
+        # ヘッダーフォントの計測用オブジェクト（未計測の列がある場合のみ作成）
         # FontConfig.HEADING の設定 ('Arial', 10, 'bold') を使用
-        heading_font = tkfont.Font(root=self.root, font=FontConfig.HEADING)
+        heading_font = None
+        title_width_cache = self._title_width_cache
         
         # 各列の設定
         self.default_column_widths = {}
@@ -349,8 +465,13 @@ class MainWindow:
                 min_w = 40
                 stretch_opt = False
             else:  # データ列
-                # タイトルの文字幅を計測し、左右にパディング(+20px)を追加
-                title_width = heading_font.measure(col) + 20
+                # タイトルの文字幅を計測し、左右にパディング(+20px)を追加（計測済みならキャッシュを使用）
+                title_width = title_width_cache.get(col)
+                if title_width is None:
+                    if heading_font is None:
+                        heading_font = tkfont.Font(root=self.root, font=FontConfig.HEADING)
+                    title_width = heading_font.measure(col) + 20
+                    title_width_cache[col] = title_width
                 # デフォルト幅(80px)とタイトル幅の大きい方を採用
                 width = max(TreeviewConfig.COL_WIDTH_DATA, title_width)
                 min_w = 60
@@ -370,9 +491,6 @@ class MainWindow:
         h_scrollbar.grid(row=1, column=0, sticky="ew")
         self.tree.configure(xscrollcommand=h_scrollbar.set)
         
-        # Treeviewのスタイル設定
-        self._configure_treeview_style()
-        
         # 行のタグ設定
         self.tree.tag_configure(TreeviewConfig.TAG_TOTAL,
                                 background=TreeviewConfig.BG_TOTAL,
@@ -398,9 +516,6 @@ class MainWindow:
                        lambda e: self.tree.xview_scroll(int(-1 * (e.delta / 120)), "units"))
         self.tree.bind("<space>", self._on_space_key)
         
-        # 右クリックメニュー(カスタム列用)
-        self.column_context_menu = tk.Menu(self.root, tearoff=0)
-        
         # ツールチップを初期化
         self.tooltip = TreeviewTooltip(self.tree, self)
 
@@ -460,10 +575,7 @@ class MainWindow:
                 
                 # 妥当な範囲かチェック
                 if 1900 <= new_year <= 2100:
-                    self.current_year = new_year
-                    self.update_year_display()
-                    self._update_month_buttons()
-                    self._show_month(self.current_month)
+                    self.navigate_to(new_year, self.current_month)
                     dialog.destroy()
                 else:
                     messagebox.showwarning("警告",
@@ -502,45 +614,49 @@ class MainWindow:
         # Escapeキーでキャンセル
         dialog.bind('<Escape>', lambda e: on_cancel())
     
-    def _configure_treeview_style(self):
-        """Treeviewのスタイルを設定"""
-        style = ttk.Style()
-        style.theme_use('clam')
-        
-        style.configure("Treeview",
-                        fieldbackground="white",
-                        background="white",
-                        rowheight=TreeviewConfig.ROW_HEIGHT,
-                        font=FontConfig.DEFAULT,
-                        borderwidth=1,
-                        relief="solid")
-        
-        style.configure("Treeview.Heading",
-                        background="#e8e8e8",
-                        font=FontConfig.HEADING,
-                        relief="raised",
-                        borderwidth=1)
-        
-        style.map("Treeview",
-                  background=[('selected', '#0078d4')],
-                  foreground=[('selected', 'yellow')])
-    
     def _prev_month(self):
         """前月に移動する"""
-        self.current_month -= 1
-        if self.current_month < 1:
-            self.current_month = 12
-            self.current_year -= 1
-        self.update_year_display()
-        self._update_month_buttons()
-        self._show_month(self.current_month)
+        self._schedule_month_change(-1)
     
     def _next_month(self):
         """翌月に移動する"""
-        self.current_month += 1
-        if self.current_month > 12:
-            self.current_month = 1
-            self.current_year += 1
+        self._schedule_month_change(1)
+    
+    def _schedule_month_change(self, delta):
+        """
+        月の移動を予約し、連続操作時は最後の1回だけ再描画する
+        
+        表示中のデータと年月がずれないよう、current_year/current_monthは
+        再描画の直前にまとめて更新する。
+        
+        Args:
+            delta: 移動する月数(-1: 前月, 1: 翌月)
+        """
+        year, month = self._pending_month or (self.current_year, self.current_month)
+        month += delta
+        if month < 1:
+            month = 12
+            year -= 1
+        elif month > 12:
+            month = 1
+            year += 1
+        self._pending_month = (year, month)
+        
+        # 年表示だけはすぐに更新する
+        if self.year_label:
+            self.year_label.config(text=str(year))
+        
+        if self._pending_redraw is not None:
+            self.root.after_cancel(self._pending_redraw)
+        self._pending_redraw = self.root.after(WindowConfig.MONTH_SWITCH_DELAY_MS, self._apply_month_change)
+    
+    def _apply_month_change(self):
+        """予約された月の移動を反映して再描画する"""
+        self._pending_redraw = None
+        if self._pending_month is None:
+            return
+        self.current_year, self.current_month = self._pending_month
+        self._pending_month = None
         self.update_year_display()
         self._update_month_buttons()
         self._show_month(self.current_month)
@@ -550,13 +666,41 @@ class MainWindow:
         if self.year_label:
             self.year_label.config(text=str(self.current_year))
     
-    def select_month(self, month):
-        """指定された月を選択する"""
+    def _cancel_month_change(self):
+        """予約中の前月/翌月の移動を取り消す"""
+        if self._pending_redraw is not None:
+            self.root.after_cancel(self._pending_redraw)
+            self._pending_redraw = None
+        self._pending_month = None
+    
+    def navigate_to(self, year, month):
+        """
+        指定された年月に移動して再描画する
+        
+        年月を直接切り替える処理はすべてここを通し、予約中の前月/翌月の移動が
+        後から実行されて表示が別の月に戻らないようにする。
+        すでにその年月を表示していて移動の予約もない場合は何もしない。
+        
+        Args:
+            year: 年
+            month: 月
+        """
+        if self._pending_redraw is None and (year, month) == (self.current_year, self.current_month):
+            return
+        self._cancel_month_change()
+        self.current_year = year
         self.current_month = month
+        self.update_year_display()
         self.current_month_button.config(text=f"📅 {month:02d}月")
         self._update_month_buttons()
         self._show_month(month)
     
+    def select_month(self, month):
+        """指定された月を選択する"""
+        # 前月/翌月の移動が予約中なら、年表示に出ている移動先の年で月を選択する
+        year = self._pending_month[0] if self._pending_month else self.current_year
+        self.navigate_to(year, month)
+    
     def _update_month_buttons(self):
         """月選択ボタンのハイライトを更新する"""
         for i, btn in enumerate(self.month_buttons, start=1):
@@ -567,150 +711,251 @@ class MainWindow:
     
     def _open_monthly_data(self):
         """月間データ詳細ダイアログを開く"""
+        # 起動時の読み込みを軽くするため、使用時にインポートする
+        from ui.monthly_data_dialog import MonthlyDataDialog
         MonthlyDataDialog(self.root, self, self.current_year, self.current_month)
     
+    def _open_search(self):
+        """検索ダイアログを開く"""
+        from ui.search_dialog import SearchDialog
+        SearchDialog(self.root, self)
+    
+    def _open_chart(self):
+        """グラフダイアログを開く（matplotlibの読み込みは初回表示時まで遅延）"""
+        from ui.chart_dialog import ChartDialog
+        ChartDialog(self.root, self)
+    
     def get_all_columns(self):
         """全ての列(デフォルト + カスタム)を取得"""
-        return DefaultColumns.ITEMS + self.data_manager.custom_columns
+        if self._all_columns_cache is None:
+            self._all_columns_cache = DefaultColumns.ITEMS + self.data_manager.custom_columns
+        return self._all_columns_cache
     
     def get_days_in_month(self):
         """現在の月の日数を取得"""
         return get_days_in_month(self.current_year, self.current_month)
     
+    def get_day_row_id(self, day):
+        """
+        表示中の月の指定日の行IDを取得する
+        
+        Args:
+            day: 日(0はまとめ行)
+            
+        Returns:
+            str: 行ID(該当する行がない場合はNone)
+        """
+        if day == 0:
+            return self._summary_row_id
+        return self._day_to_row_id.get(day)
+    
+    def get_row_day(self, row_id):
+        """
+        表示中の月の行IDから日を取得する（get_day_row_idの逆引き）
+        
+        Args:
+            row_id: 行ID
+            
+        Returns:
+            int: 日(まとめ行は0、合計行や該当する行がない場合はNone)
+        """
+        if row_id == self._summary_row_id:
+            return 0
+        return self._row_to_day.get(row_id)
+    
+    def get_total_row_id(self):
+        """
+        表示中の月の合計行の行IDを取得する
+        
+        Returns:
+            str: 合計行の行ID(Treeview再作成中はNone)
+        """
+        return self._total_row_id
+    
     def _show_month(self, month):
         """指定された月のデータを表示する"""
         if not self.tree:
             return
         
-        # 既存の表示をクリア
-        for item in self.tree.get_children():
-            self.tree.delete(item)
+        tree = self.tree
+        
+        # 行は削除せず再利用するため、前の月の選択状態とツールチップをクリア
+        tree.selection_set(())
+        if self.tooltip is not None:
+            self.tooltip.reset()
+        self.ctrl_selected_cells = set()
+        self.selection_start_row = None
+        self.selection_start_col = None
         
         all_columns = self.get_all_columns()
         days = self.get_days_in_month()
         
-        # 各日のデータを表示
+        # ループ内で繰り返し参照する属性をローカル変数に束縛
+        # （日付行はttkのラッパーを通さずTclコマンドを直接呼び、オプション整形の処理を省く）
+        tk_call = tree.tk.call
+        w = tree._w
+        insert = tree.insert
+        move = tree.move
+        calc = self._calculate_day_totals
+        year = self.current_year
+        cur_month = self.current_month
+        # タグは行ごとにタプルを作らないよう、あらかじめタプルにしておく
+        TAG_SAT = (TreeviewConfig.TAG_SAT,)
+        TAG_SUN = (TreeviewConfig.TAG_SUN,)
+        TAG_ODD = (TreeviewConfig.TAG_ODD,)
+        TAG_NORMAL = (TreeviewConfig.TAG_NORMAL,)
+        first_weekday = datetime.date(year, cur_month, 1).weekday()  # 以降の曜日は算術で求める
+        pool = self._day_row_pool
+        attached = self._attached_day_rows
+        day_to_row_id = {}
+        col_range = range(1, len(all_columns))
+        sums = [0] * (len(all_columns) - 1)  # 表示と同時に列ごとの合計を集計
+        
+        # 各日のデータを表示（既存の行は値とタグだけ書き換え、足りない分のみ挿入）
         for day in range(1, days + 1):
-            row_values = self._calculate_day_totals(day)
-            formatted_values = self._format_row_values(row_values)
-            formatted_values.append("")  # +ボタン列
+            weekday = (first_weekday + day - 1) % 7
+            row_values, amounts = calc(day, weekday, all_columns)  # row_valuesは+ボタン列込みのタプル
+            for i in col_range:
+                sums[i - 1] += amounts[i]
             
             # 土日・奇数偶数行で背景色を変える
-            weekday = datetime.date(self.current_year, self.current_month, day).weekday()
             if weekday == 5:  # 5=土
-                tag = TreeviewConfig.TAG_SAT
+                tag = TAG_SAT
             elif weekday == 6:  # 6=日
-                tag = TreeviewConfig.TAG_SUN
+                tag = TAG_SUN
             else:
-                tag = TreeviewConfig.TAG_ODD if day % 2 == 1 else TreeviewConfig.TAG_NORMAL
+                tag = TAG_ODD if day % 2 == 1 else TAG_NORMAL
 
-            self.tree.insert("", "end", values=formatted_values, tags=(tag,))
-        
-        # 合計行
-        total_row = [" 合計 "] + ["  "] * (len(all_columns) - 1) + [""]
-        self.tree.insert("", "end", values=total_row, tags=(TreeviewConfig.TAG_TOTAL,))
-        
-        # まとめ行(収入・支出の表示)
-        income_val = self._get_income_total()
-        inc_str = f" {income_val} " if income_val != 0 else "  "
-        summary_row = [" まとめ ", "  ", " 収入 ", inc_str, " 支出 ", "  "] + \
-                      ["  "] * (len(all_columns) - 6) + [""]
-        self.tree.insert("", "end", values=summary_row, tags=(TreeviewConfig.TAG_SUMMARY,))
+            index = day - 1
+            if index < len(pool):
+                row_id = pool[index]
+                tk_call(w, "item", row_id, "-values", row_values, "-tags", tag)
+                if index >= attached:
+                    # 前の月で非表示にした行を元の位置に戻す
+                    move(row_id, "", index)
+            else:
+                row_id = tk_call(w, "insert", "", index, "-values", row_values, "-tags", tag)
+                pool.append(row_id)
+            day_to_row_id[day] = row_id
+        
+        # 前の月より日数が少ない場合、余った行は削除せず非表示にしておく
+        if attached > days:
+            tree.detach(*pool[days:attached])
+        self._attached_day_rows = days
+        self._day_to_row_id = day_to_row_id
+        self._row_to_day = {row_id: day for day, row_id in day_to_row_id.items()}
+        self._col_sums = sums
+        
+        # 合計行・まとめ行(収入・支出の表示)は初回のみ作成し、値は_update_totalsで設定
+        total_row_id = self._total_row_id
+        if total_row_id is None:
+            total_row_id = insert("", "end", tags=(TreeviewConfig.TAG_TOTAL,))
+        summary_row_id = self._summary_row_id
+        if summary_row_id is None:
+            summary_row_id = insert("", "end", tags=(TreeviewConfig.TAG_SUMMARY,))
+        
+        # 収入の合計（まとめ行の表示から読み戻さずに済むよう数値で保持）
+        self._income_total = self._get_income_total()
+        
+        # 行IDをキャッシュ（以降の処理でget_children()を呼ばずに済むように）
+        self._row_ids = tuple(day_to_row_id.values()) + (total_row_id, summary_row_id)
+        self._row_pos = {rid: i for i, rid in enumerate(self._row_ids)}
+        self._total_row_id = total_row_id
+        self._summary_row_id = summary_row_id
         
         # 合計とまとめ行の値を更新
         self._update_totals()
     
-    def _calculate_day_totals(self, day):
-        """特定の日の各項目の合計金額を計算する"""
-        all_columns = self.get_all_columns()
-        totals = [""] * len(all_columns)
-        
-        weekdays = ["月", "火", "水", "木", "金", "土", "日"]
-        wd = datetime.date(self.current_year, self.current_month, day).weekday()
-        totals[0] = f"{day}({weekdays[wd]})"  # 日付列
-        
-        # 各項目の合計を計算
-        for col_index in range(1, len(all_columns)):
-            dict_key = f"{self.current_year}-{self.current_month}-{day}-{col_index}"
-            data_list = self.data_manager.get_transaction_data(dict_key)
-            if data_list:
-                # 金額列(インデックス1)を合計
-                total = sum(parse_amount(row[1]) for row in data_list if len(row) > 1)
-                if total != 0:
-                    totals[col_index] = str(total)
-        
-        return totals
-    
-    def _format_row_values(self, values):
-        """行データを表示用にフォーマットする"""
-        formatted = []
-        for i, val in enumerate(values):
-            if i == 0:  # 日付列
-                formatted.append(f" {val} ")
-            else:
-                formatted.append(f" {val} " if val else "  ")
-        return formatted
+    def _calculate_day_totals(self, day, weekday=None, all_columns=None):
+        """
+        特定の日の各項目の合計金額を計算する
+        
+        月を行き来しても再集計しないよう、データに変更がない間は結果をキャッシュする。
+        
+        Args:
+            day: 日
+            weekday: 曜日(0=月曜)。省略時は日付から求める
+            all_columns: 全列のリスト。省略時はget_all_columns()で取得
+            
+        Returns:
+            tuple: (表示用の値のタプル(+ボタン列を含む), 各列の合計金額(int)のリスト)
+        """
+        if all_columns is None:
+            all_columns = self.get_all_columns()
+        n_cols = len(all_columns)
+        
+        # データが変更されていればキャッシュを破棄
+        version = self.data_manager.version
+        if version != self._day_totals_version:
+            self._day_totals_cache = {}
+            self._day_totals_version = version
+        
+        cache_key = (self.current_year, self.current_month, day, n_cols)
+        cached = self._day_totals_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
+        totals = [""] * n_cols
+        amounts = [0] * n_cols  # 数値のまま保持（合計行の集計用）
+        
+        if weekday is None:
+            weekday = datetime.date(self.current_year, self.current_month, day).weekday()
+        totals[0] = f"{day}({WEEKDAY_NAMES[weekday]})"  # 日付列
+        
+        # 各項目の合計を計算（金額列の合計はデータマネージャーがキャッシュ）
+        get_total = self.data_manager.get_amount_total
+        for col_index in range(1, n_cols):
+            total = get_total((self.current_year, self.current_month, day, col_index))
+            if total != 0:
+                totals[col_index] = str(total)
+                amounts[col_index] = total
+        
+        # Treeviewにそのまま渡せるよう、+ボタン列を付けたタプルで保持
+        result = (tuple(totals) + ("",), amounts)
+        self._day_totals_cache[cache_key] = result
+        return result
     
     def _get_income_total(self):
         """現在月の収入合計を取得する"""
-        dict_key = f"{self.current_year}-{self.current_month}-0-3"
-        data_list = self.data_manager.get_transaction_data(dict_key)
-        if data_list:
-            return sum(parse_amount(row[1]) for row in data_list if len(row) > 1)
-        return 0
+        dict_key = (self.current_year, self.current_month, 0, 3)
+        return self.data_manager.get_amount_total(dict_key)
     
     def _update_totals(self):
         """合計行とまとめ行の値を更新する"""
-        items = self.tree.get_children()
+        items = self._row_ids
         if len(items) < 2:
             return
         
-        total_row_id = items[-2]  # 合計行
-        summary_row_id = items[-1]  # まとめ行
+        total_row_id = self._total_row_id  # 合計行
+        summary_row_id = self._summary_row_id  # まとめ行
         all_columns = self.get_all_columns()
         cols = len(all_columns)
         
-        # 各列の合計を計算
-        sums = [0] * (cols - 1)
-        for row_id in items[:-2]:  # 日付行のみ対象
-            row_vals = self.tree.item(row_id, 'values')
-            for i in range(1, cols):
-                try:
-                    val_str = str(row_vals[i]).strip() if i < len(row_vals) else ""
-                    sums[i - 1] += int(val_str) if val_str else 0
-                except (ValueError, TypeError, IndexError):
-                    pass
+        # 各列の合計（_show_monthで集計済み、セル更新時に差分で更新済み）
+        item = self.tree.item
+        sums = self._col_sums
         
-        # 合計行を更新
-        total_vals = list(self.tree.item(total_row_id, 'values'))
-        for i in range(1, cols):
-            total_vals[i] = f" {sums[i - 1]} " if sums[i - 1] != 0 else "  "
+        EMPTY_CELL = TreeviewConfig.EMPTY_CELL
         
-        while len(total_vals) <= cols:
-            total_vals.append("")
-        self.tree.item(total_row_id, values=total_vals)
+        # 合計行を更新
+        total_vals = ["合計"] + [str(s) if s != 0 else EMPTY_CELL for s in sums] + [""]
+        item(total_row_id, values=total_vals)
         
         # 総支出を計算
-        grand_total = sum(int(str(v).strip()) for v in total_vals[1:cols]
-                          if v and str(v).strip() and str(v).strip().lstrip('-').isdigit())
+        grand_total = sum(sums)
         
-        # まとめ行を更新
-        summary_vals = list(self.tree.item(summary_row_id, 'values'))
-        try:
-            income_str = str(summary_vals[3]).strip() if len(summary_vals) > 3 else ""
-            income_val = int(income_str) if income_str else 0
-        except:
-            income_val = 0
-        
-        # 収支差額と総支出を更新
+        # まとめ行を更新（+ボタン列を含めた長さで確保し、必要なセルだけ設定）
+        income_val = self._income_total
         balance = income_val - grand_total
-        summary_vals[1] = f" {balance} " if balance != 0 else "  "
-        summary_vals[5] = f" {grand_total} " if grand_total != 0 else "  "
-        
-        while len(summary_vals) <= cols:
-            summary_vals.append("")
-        
-        self.tree.item(summary_row_id, values=summary_vals)
+        summary_vals = [EMPTY_CELL] * (cols + 1)
+        summary_vals[0] = "まとめ"
+        summary_vals[1] = str(balance) if balance != 0 else EMPTY_CELL
+        summary_vals[2] = "収入"
+        summary_vals[3] = str(income_val) if income_val != 0 else EMPTY_CELL
+        summary_vals[4] = "支出"
+        summary_vals[5] = str(grand_total) if grand_total != 0 else EMPTY_CELL
+        summary_vals[cols] = ""
+        item(summary_row_id, values=summary_vals)
     
     def _on_single_click(self, event):
         """シングルクリックイベントを処理する"""
@@ -720,69 +965,77 @@ class MainWindow:
         col_id = self.tree.identify_column(event.x)
         row_id = self.tree.identify_row(event.y)
         
-        if col_id:
-            self.selected_column_id = col_id
-        
-        # Shift+クリックの場合は範囲選択
-        if event.state & 0x1 and row_id and col_id:  # Shiftキー
-            if self.selection_start_row and self.selection_start_col:
-                # 範囲選択を実行
-                self._select_range(self.selection_start_row, self.selection_start_col, row_id, col_id)
-                # Ctrl選択リストをクリア
-                self.ctrl_selected_cells = []
-                return
-        
-        # Ctrl+クリックの場合は個別選択モード
-        if event.state & 0x4 and row_id and col_id:  # Ctrlキー
-            # このセルをCtrl選択リストに追加（重複チェック）
-            cell_tuple = (row_id, col_id)
-            if cell_tuple in self.ctrl_selected_cells:
-                # 既に選択されている場合は削除（トグル）
-                self.ctrl_selected_cells.remove(cell_tuple)
-            else:
-                # 新規追加
-                self.ctrl_selected_cells.append(cell_tuple)
+        if not col_id:
             return
+        col_idx = int(col_id[1:]) - 1
+        self.selected_column_idx = col_idx
         
-        # 通常のクリック（Shift/Ctrl押下なし）の場合
-        if row_id and col_id:
+        # Shift/Ctrl+クリックは修飾キーに応じた処理に振り分け
+        if row_id:
+            handler = self._click_dispatch.get(event.state & 0x5)
+            if handler and handler(row_id, col_idx):
+                return
+            
+            # 通常のクリック（Shift/Ctrl押下なし）の場合
             # 範囲選択の開始点を記録
             self.selection_start_row = row_id
-            self.selection_start_col = col_id
+            self.selection_start_col = col_idx
             # Ctrl選択リストをクリア
-            self.ctrl_selected_cells = [(row_id, col_id)]
+            self.ctrl_selected_cells = {(row_id, col_idx)}
 
         if region == "heading":
-            if col_id:
-                col_index = int(col_id[1:]) - 1
-                all_columns = self.get_all_columns()
-                
-                if col_index == len(all_columns):  # +ボタン列
-                    self._add_column()
+            if col_idx == len(self.get_all_columns()):  # +ボタン列
+                self._add_column()
+    
+    def _handle_shift_click(self, row_id, col_idx):
+        """
+        Shift+クリック：範囲選択を行う
+        
+        Returns:
+            bool: 処理した場合True（範囲選択の開始点がない場合はFalse）
+        """
+        if not self.selection_start_row or self.selection_start_col is None:
+            return False
+        # 範囲選択を実行
+        self._select_range(self.selection_start_row, self.selection_start_col, row_id, col_idx)
+        # Ctrl選択リストをクリア
+        self.ctrl_selected_cells = set()
+        return True
+    
+    def _handle_ctrl_click(self, row_id, col_idx):
+        """
+        Ctrl+クリック：個別選択モードでセルの選択を切り替える
+        
+        Returns:
+            bool: 常にTrue
+        """
+        # このセルのCtrl選択を切り替え（既に選択されている場合は解除）
+        cell_tuple = (row_id, col_idx)
+        if cell_tuple in self.ctrl_selected_cells:
+            self.ctrl_selected_cells.discard(cell_tuple)
+        else:
+            self.ctrl_selected_cells.add(cell_tuple)
+        return True
     
-    def _select_range(self, start_row_id, start_col_id, end_row_id, end_col_id):
+    def _select_range(self, start_row_id, start_col_idx, end_row_id, end_col_idx):
         """
         開始セルと終了セルの間の矩形範囲を選択する
         
         Args:
             start_row_id: 開始行ID
-            start_col_id: 開始列ID（"#1", "#2"など）
+            start_col_idx: 開始列インデックス（0始まり）
             end_row_id: 終了行ID
-            end_col_id: 終了列ID
+            end_col_idx: 終了列インデックス
         """
-        items = self.tree.get_children()
+        items = self._row_ids
+        row_pos = self._row_pos
         
         # 行のインデックスを取得
-        try:
-            start_row_idx = items.index(start_row_id)
-            end_row_idx = items.index(end_row_id)
-        except ValueError:
+        start_row_idx = row_pos.get(start_row_id)
+        end_row_idx = row_pos.get(end_row_id)
+        if start_row_idx is None or end_row_idx is None:
             return
         
-        # 列のインデックスを取得
-        start_col_idx = int(start_col_id[1:]) - 1
-        end_col_idx = int(end_col_id[1:]) - 1
-        
         # 開始と終了を正規化（小さい方が先）
         if start_row_idx > end_row_idx:
             start_row_idx, end_row_idx = end_row_idx, start_row_idx
@@ -806,80 +1059,43 @@ class MainWindow:
         if not row_id or not col_id:
             return
         
+        col_index = int(col_id[1:]) - 1
+        
         # ヘッダーのクリック処理
         region = self.tree.identify_region(event.x, event.y)
         if region == "heading":
-            col_index = int(col_id[1:]) - 1
             all_columns = self.get_all_columns()
             
             if col_index == len(all_columns):  # +ボタン
                 self._add_column()
-            elif col_index >= len(DefaultColumns.ITEMS):  # カスタム列
+            elif col_index >= self._n_default_columns:  # カスタム列
                 self._edit_column_name(col_index)
             return
         
-        # 行の種類を判定
-        items = self.tree.get_children()
-        if len(items) < 2:
-            return
-        
-        total_row_id = items[-2]
-        summary_row_id = items[-1]
-        
-        # 合計行は編集不可
-        if row_id == total_row_id:
-            return
-        
-        # まとめ行は収入列のみ編集可能
-        if row_id == summary_row_id and col_id != "#4":
-            return
-        
-        # 日付列は編集不可
-        if col_id == "#1":
-            return
-        
-        # +ボタン列は編集不可
-        col_index = int(col_id[1:]) - 1
-        all_columns = self.get_all_columns()
-        if col_index >= len(all_columns):
-            return
-        
-        # 行データを取得
-        row_vals = self.tree.item(row_id, 'values')
-        if not row_vals:
+        target = self._resolve_edit_target(row_id, col_index)
+        if target is None:
             return
-        
-        # 日付と列名を特定
-        if row_id == summary_row_id:
-            day = 0
-            col_index = 3  # 収入列
-            col_name = "収入"
-        else:
-            try:
-                m = re.search(r'\d+', str(row_vals[0]))
-                if not m:
-                    return
-                day = int(m.group())
-            except:
-                return
-            col_name = self.tree.heading(col_id, "text")
-        
-        # 取引詳細ダイアログを開く
-        dict_key = f"{self.current_year}-{self.current_month}-{day}-{col_index}"
+        dict_key, col_name = target
         
         # ダイアログを開く前にデータを保存
         old_data = self.data_manager.get_transaction_data(dict_key)
         
-        # ダイアログを開く
-        dialog = TransactionDialog(self.root, self, dict_key, col_name)
-        
-        # ダイアログが閉じた後、データが変更されていれば元に戻すスタックに保存
-        self.root.wait_window(dialog)
-        new_data = self.data_manager.get_transaction_data(dict_key)
+        # ダイアログを開く（閉じるまで待たず、閉じた時にコールバックで結果を受け取る）
+        TransactionDialog(self.root, self, dict_key, col_name,
+                          on_close=lambda new_data: self._finish_edit(dict_key, old_data, new_data))
+    
+    def _finish_edit(self, dict_key, old_data, new_data):
+        """
+        取引詳細ダイアログが閉じた後の処理
         
-        # データが変更されていれば記録
+        Args:
+            dict_key: 編集したセルのキー(年, 月, 日, 列インデックス)
+            old_data: ダイアログを開く前の取引データ
+            new_data: ダイアログを閉じた時点の取引データ
+        """
+        # データが変更されていれば元に戻すスタックに記録
         if old_data != new_data:
-            self._save_undo_state('edit_detail', [(dict_key, old_data[:] if old_data else None)])
+            self._save_undo_state('edit_detail', [(dict_key, old_data or None)])
     
     def _on_right_click(self, event):
         """右クリックイベントを処理する"""
@@ -895,18 +1111,10 @@ class MainWindow:
                 # 選択状態を更新
                 self.tree.selection_set(row_id)
                 self.tree.focus(row_id)
-                self.selected_column_id = col_id
+                self.selected_column_idx = int(col_id[1:]) - 1
                 
-                # コンテキストメニュー作成
-                cell_menu = tk.Menu(self.root, tearoff=0)
-                cell_menu.add_command(label="元に戻す (Ctrl+Z)", command=self._undo)
-                cell_menu.add_separator()
-                cell_menu.add_command(label="切り取り (Ctrl+X)", command=self._cut_cells)
-                cell_menu.add_command(label="コピー (Ctrl+C)", command=self._copy_cells)
-                cell_menu.add_command(label="貼り付け (Ctrl+V)", command=self._paste_cells)
-                cell_menu.add_separator()
-                cell_menu.add_command(label="削除 (Delete)", command=self._delete_cells)
-                cell_menu.post(event.x_root, event.y_root)
+                # コンテキストメニューを表示（作成済みのものを再利用）
+                self.cell_context_menu.post(event.x_root, event.y_root)
             return
         
         col_id = self.tree.identify_column(event.x)
@@ -916,22 +1124,12 @@ class MainWindow:
         col_index = int(col_id[1:]) - 1
         all_columns = self.get_all_columns()
         
-        # 右クリックメニューを再作成
-        self.column_context_menu = tk.Menu(self.root, tearoff=0)
-        
-        # カスタム列の場合は編集・削除オプションを追加
-        if len(all_columns) > col_index >= len(DefaultColumns.ITEMS) and col_index != 0:
+        # カスタム列の場合は編集・削除オプション付きのメニューを表示
+        if len(all_columns) > col_index >= self._n_default_columns and col_index != 0:
             self.selected_column_index = col_index
-            self.column_context_menu.add_command(label="列名を編集", command=self._edit_column_name)
-            self.column_context_menu.add_separator()
-            self.column_context_menu.add_command(label="列を削除", command=self._delete_column)
-            self.column_context_menu.add_separator()
-        
-        # すべての列で列幅リセットを利用可能
-        self.column_context_menu.add_command(label="全ての列幅をリセット",
-                                             command=self._reset_all_column_widths)
-        
-        self.column_context_menu.post(event.x_root, event.y_root)
+            self.custom_column_menu.post(event.x_root, event.y_root)
+        else:
+            self.column_context_menu.post(event.x_root, event.y_root)
     
     def _on_mousewheel(self, event):
         """マウスホイールイベントを処理する"""
@@ -959,60 +1157,58 @@ class MainWindow:
         # 現在選択されている列のインデックスを取得
         # （Treeviewは列のフォーカスを直接取得できないため、
         # 最後にクリックされた列を使用）
-        if not hasattr(self, 'selected_column_id') or not self.selected_column_id:
+        if self.selected_column_idx is None:
             return
         
-        col_id = self.selected_column_id
-        col_index = int(col_id[1:]) - 1
-        
-        # 編集不可のセルをチェック
-        items = self.tree.get_children()
-        if len(items) < 2:
+        target = self._resolve_edit_target(row_id, self.selected_column_idx)
+        if target is None:
             return
+        dict_key, col_name = target
         
-        total_row_id = items[-2]
-        summary_row_id = items[-1]
+        # 取引詳細ダイアログを開く
+        TransactionDialog(self.root, self, dict_key, col_name)
+    
+    def _resolve_edit_target(self, row_id, col_index):
+        """
+        編集対象のセルを判定し、取引データのキーと列名を返す
+        
+        Args:
+            row_id: 行ID
+            col_index: 列インデックス（0始まり）
+            
+        Returns:
+            tuple: (dict_key, col_name)。編集できないセルの場合はNone
+        """
+        if len(self._row_ids) < 2:
+            return None
+        
+        summary_row_id = self._summary_row_id
         
         # 合計行は編集不可
-        if row_id == total_row_id:
-            return
+        if row_id == self._total_row_id:
+            return None
         
         # まとめ行は収入列のみ編集可能
-        if row_id == summary_row_id and col_id != "#4":
-            return
+        if row_id == summary_row_id:
+            if col_index != 3:
+                return None
+            return (self.current_year, self.current_month, 0, 3), "収入"
         
         # 日付列は編集不可
-        if col_id == "#1":
-            return
+        if col_index == 0:
+            return None
         
         # +ボタン列は編集不可
-        all_columns = self.get_all_columns()
-        if col_index >= len(all_columns):
-            return
+        if col_index >= len(self.get_all_columns()):
+            return None
         
-        # 行データを取得
-        row_vals = self.tree.item(row_id, 'values')
-        if not row_vals:
-            return
+        # 行の日付を特定
+        day = self._row_to_day.get(row_id)
+        if day is None:
+            return None
         
-        # 日付と列名を特定
-        if row_id == summary_row_id:
-            day = 0
-            col_index = 3  # 収入列
-            col_name = "収入"
-        else:
-            try:
-                m = re.search(r'\d+', str(row_vals[0]))
-                if not m:
-                    return
-                day = int(m.group())
-            except:
-                return
-            col_name = self.tree.heading(col_id, "text")
-        
-        # 取引詳細ダイアログを開く
-        dict_key = f"{self.current_year}-{self.current_month}-{day}-{col_index}"
-        TransactionDialog(self.root, self, dict_key, col_name)
+        col_name = self.tree.heading(f"#{col_index + 1}", "text")
+        return (self.current_year, self.current_month, day, col_index), col_name
     
     def _reset_all_column_widths(self):
         """指定された列の幅をデフォルトにリセットする"""
@@ -1054,9 +1250,9 @@ class MainWindow:
                 all_columns = self.get_all_columns()
                 if column_name not in all_columns:
                     self.data_manager.add_custom_column(column_name)
+                    self._all_columns_cache = None
                     dialog.destroy()
-                    self._recreate_treeview()
-                    self._show_month(self.current_month)
+                    self._request_rebuild()
                 else:
                     messagebox.showwarning("警告", "その列名は既に存在します。", parent=dialog)
             else:
@@ -1074,6 +1270,17 @@ class MainWindow:
             tree_parent = self.tree.master
             self.tree.destroy()
             self.tree = None
+            # 行IDキャッシュを無効化
+            self._row_ids = ()
+            self._row_pos = {}
+            self._total_row_id = None
+            self._summary_row_id = None
+            self._day_to_row_id = {}
+            self._row_to_day = {}
+            self._day_row_pool = []
+            self._attached_day_rows = 0
+            self._col_sums = []
+            self._all_columns_cache = None
             self._create_treeview(tree_parent)
 
     def _edit_column_name(self, col_index=None):
@@ -1081,19 +1288,20 @@ class MainWindow:
         if col_index is None:
             col_index = getattr(self, 'selected_column_index', None)
         
-        if col_index is None or col_index < len(DefaultColumns.ITEMS):
+        if col_index is None or col_index < self._n_default_columns:
             return
         
-        custom_index = col_index - len(DefaultColumns.ITEMS)
+        custom_index = col_index - self._n_default_columns
         if custom_index >= len(self.data_manager.custom_columns):
             return
         
         old_name = self.data_manager.custom_columns[custom_index]
+        self._rename_target = (col_index, old_name)
         
-        # 編集ダイアログを表示
-        dialog = tk.Toplevel(self.root)
-        dialog.title("列名の編集")
-        dialog.resizable(False, False)
+        # 編集ダイアログを表示（生成済みであれば再利用）
+        if self._rename_dialog is None:
+            self._build_rename_dialog()
+        dialog = self._rename_dialog
         
         dialog_width = 300
         dialog_height = 120
@@ -1102,47 +1310,90 @@ class MainWindow:
         y = self.root.winfo_y() + (self.root.winfo_height() - dialog_height) // 2
         
         dialog.geometry(f"{dialog_width}x{dialog_height}+{x}+{y}")
-        dialog.transient(self.root)
+        dialog.deiconify()
         dialog.grab_set()
         
+        entry = self._rename_entry
+        entry.delete(0, tk.END)
+        entry.insert(0, old_name)
+        entry.select_range(0, tk.END)
+        entry.focus_set()
+    
+    def _build_rename_dialog(self):
+        """列名編集ダイアログのウィジェットを生成する（初回のみ）"""
+        dialog = tk.Toplevel(self.root)
+        dialog.withdraw()
+        dialog.title("列名の編集")
+        dialog.resizable(False, False)
+        dialog.transient(self.root)
+        
         tk.Label(dialog, text="新しい列名を入力してください:", font=('Arial', 11)).pack(pady=10)
         
         entry = tk.Entry(dialog, font=('Arial', 11), width=25)
         entry.pack(pady=5)
-        entry.insert(0, old_name)
-        entry.select_range(0, tk.END)
-        entry.focus_set()
         
         button_frame = tk.Frame(dialog)
         button_frame.pack(pady=10)
         
-        def on_ok():
-            new_name = entry.get().strip()
-            if new_name and new_name != old_name:
-                all_columns = self.get_all_columns()
-                if new_name not in all_columns:
-                    self.data_manager.edit_custom_column(old_name, new_name)
-                    dialog.destroy()
-                    self._recreate_treeview()
-                    self._show_month(self.current_month)
-                else:
-                    messagebox.showwarning("警告", "その列名は既に存在します。", parent=dialog)
-            else:
-                dialog.destroy()
+        tk.Button(button_frame, text="OK", command=self._finish_rename, width=8).pack(side=tk.LEFT, padx=5)
+        tk.Button(button_frame, text="キャンセル", command=self._hide_rename_dialog, width=8).pack(side=tk.LEFT, padx=5)
         
-        tk.Button(button_frame, text="OK", command=on_ok, width=8).pack(side=tk.LEFT, padx=5)
-        tk.Button(button_frame, text="キャンセル", command=dialog.destroy, width=8).pack(side=tk.LEFT, padx=5)
+        entry.bind('<Return>', lambda e: self._finish_rename())
+        dialog.bind('<Escape>', lambda e: self._hide_rename_dialog())
+        dialog.protocol("WM_DELETE_WINDOW", self._hide_rename_dialog)
         
-        entry.bind('<Return>', lambda e: on_ok())
-        dialog.bind('<Escape>', lambda e: dialog.destroy())
+        self._rename_dialog = dialog
+        self._rename_entry = entry
+    
+    def _hide_rename_dialog(self):
+        """列名編集ダイアログを破棄せずに非表示にする"""
+        dialog = self._rename_dialog
+        dialog.grab_release()
+        dialog.withdraw()
+        self._rename_target = None
+    
+    def _finish_rename(self):
+        """列名編集ダイアログのOK処理"""
+        if self._rename_target is None:
+            return
+        col_index, old_name = self._rename_target
+        
+        new_name = self._rename_entry.get().strip()
+        if new_name and new_name != old_name:
+            all_columns = self.get_all_columns()
+            if new_name not in all_columns:
+                self.data_manager.edit_custom_column(old_name, new_name)
+                self._all_columns_cache = None
+                self._hide_rename_dialog()
+                
+                # 列名の変更のみなので、Treeviewを再作成せずヘッダーと列幅だけ更新
+                col_id = f"#{col_index + 1}"
+                self.tree.heading(col_id, text=new_name)
+                
+                # 新しい列名の文字幅を計測し、収まらない場合は列幅を広げる
+                title_width = self._title_width_cache.get(new_name)
+                if title_width is None:
+                    heading_font = tkfont.Font(root=self.root, font=FontConfig.HEADING)
+                    title_width = heading_font.measure(new_name) + 20
+                    self._title_width_cache[new_name] = title_width
+                width = max(title_width, int(self.tree.column(col_id, 'width')))
+                self.tree.column(col_id, width=width)
+                
+                # 列幅リセット時の幅は、Treeview再作成時と同じ計算にそろえる
+                self.default_column_widths.pop(old_name, None)
+                self.default_column_widths[new_name] = max(TreeviewConfig.COL_WIDTH_DATA, title_width)
+            else:
+                messagebox.showwarning("警告", "その列名は既に存在します。", parent=self._rename_dialog)
+        else:
+            self._hide_rename_dialog()
 
     def _delete_column(self):
         """カスタム列を削除する"""
         col_index = getattr(self, 'selected_column_index', None)
-        if col_index is None or col_index < len(DefaultColumns.ITEMS):
+        if col_index is None or col_index < self._n_default_columns:
             return
         
-        custom_index = col_index - len(DefaultColumns.ITEMS)
+        custom_index = col_index - self._n_default_columns
         if custom_index >= len(self.data_manager.custom_columns):
             return
         
@@ -1152,64 +1403,154 @@ class MainWindow:
         if messagebox.askyesno("確認", f"列 '{col_name}' を削除しますか?\n※この列のデータもすべて削除されます。"):
             # 列をリストから削除
             self.data_manager.delete_custom_column(col_name)
+            self._all_columns_cache = None
             
             # 関連するデータを削除
             self.data_manager.delete_column_data(col_index)
             
-            # Treeviewを再作成して変更を反映
-            self._recreate_treeview()
-            self._show_month(self.current_month)
+            # Treeviewの再作成はアイドル時に行い、確認ダイアログをすぐに閉じる
+            self._request_rebuild()
+    
+    def _request_rebuild(self):
+        """Treeviewの再作成と現在月の再表示を予約する（アイドル時に1回だけ実行）"""
+        if not self._rebuild_pending:
+            self._rebuild_pending = True
+            self.root.after_idle(self._rebuild_and_show_current_month)
+    
+    def _rebuild_and_show_current_month(self):
+        """予約されたTreeviewの再作成と現在月の再表示を実行する"""
+        self._rebuild_pending = False
+        self._recreate_treeview()
+        self._show_month(self.current_month)
 
-    def update_parent_cell(self, dict_key_day, col_index, new_value):
-        """親画面のセル表示を更新する"""
-        # キーから年月日を抽出
-        y, mo, d = dict_key_day.split("-")
-        y, mo, d = int(y), int(mo), int(d)
+    def update_parent_cell(self, day_key, col_index, new_value):
+        """
+        親画面のセル表示を更新する
+        
+        Args:
+            day_key: (年, 月, 日) のタプル
+            col_index: 列インデックス
+            new_value: 表示する値
+        """
+        # Treeview再作成中は何もしない
+        if self.tree is None:
+            return
         
         # 現在表示中の年月と一致する場合のみ更新
-        if (self.current_year == y) and (self.current_month == mo):
-            items = self.tree.get_children()
-            if len(items) < 2:
+        y, mo, d = day_key
+        if y != self.current_year or mo != self.current_month:
+            return
+        
+        self._set_day_cell(d, col_index, new_value)
+    
+    def _set_day_cell(self, day, col_index, new_value):
+        """
+        表示中の月の指定日のセルを更新し、合計の再計算を予約する
+        
+        年月が表示中の月であることが分かっている呼び出し元（貼り付け・削除など）は
+        update_parent_cellの判定を通さずにこちらを直接呼ぶ。
+        
+        Args:
+            day: 日(0はまとめ行)
+            col_index: 列インデックス
+            new_value: 表示する値
+        """
+        if len(self._row_ids) < 2:
+            return
+        
+        # 該当する行を取得（日付行は索引から、0はまとめ行）
+        if day == 0:
+            row_id = self._summary_row_id
+        else:
+            row_id = self._day_to_row_id.get(day)
+            if row_id is None:
                 return
+        
+        # セルのデータが書き換えられたため、合計が同じでも表示中のツールチップ(内訳)は判定し直させる
+        if self.tooltip is not None:
+            self.tooltip.reset()
+        
+        # 表示値を決定：日付行・まとめ行で共用
+        display_value = self._format_cell(new_value)
+        
+        # 表示が変わる場合のみ該当セルを更新（行は挿入時に全列分の値を持っている）
+        old_value = self._get_cell_value(row_id, col_index)
+        if old_value == display_value:
+            # 表示に変化がなければ合計の再計算も不要
+            return
+        self._put_cell_value(row_id, col_index, display_value)
+        
+        if day == 0:
+            # まとめ行(収入)
+            if col_index == 3:  # 収入列
+                self._income_total = parse_amount(display_value)
+        else:
+            # 列の合計は差分だけ更新する
+            self._col_sums[col_index - 1] += parse_amount(display_value) - parse_amount(old_value)
+        
+        self._request_totals_recompute()
+    
+    def _get_cell_value(self, row_id, col_index):
+        """セルの表示値を取得する（一括更新中は未反映の値を含めて返す）"""
+        bulk = self._bulk_rows
+        if bulk is None:
+            return str(self.tree.set(row_id, col_index))
+        values = bulk.get(row_id)
+        if values is None:
+            values = bulk[row_id] = list(self.tree.item(row_id, 'values'))
+        return str(values[col_index])
+    
+    def _put_cell_value(self, row_id, col_index, value):
+        """セルの表示値を設定する（一括更新中は行ごとにためておき、終了時にまとめて反映）"""
+        bulk = self._bulk_rows
+        if bulk is None:
+            self.tree.set(row_id, col_index, value)
+        else:
+            # _get_cell_valueで行の値を読み込み済み
+            bulk[row_id][col_index] = value
+    
+    def _begin_bulk_update(self):
+        """複数セルの一括更新を開始する（セルごとのTreeview更新を行単位にまとめる）"""
+        self._bulk_rows = {}
+    
+    def _end_bulk_update(self):
+        """一括更新を終了し、変更された行を1行につき1回の呼び出しで反映する"""
+        bulk = self._bulk_rows
+        self._bulk_rows = None
+        if not bulk:
+            return
+        item = self.tree.item
+        for row_id, values in bulk.items():
+            item(row_id, values=values)
+    
+    def _request_totals_recompute(self):
+        """合計とまとめ行の再計算を予約する（アイドル時に1回だけ実行）"""
+        if not self._totals_dirty:
+            self._totals_dirty = True
+            self.root.after_idle(self._flush_totals)
+    
+    @staticmethod
+    def _format_cell(value):
+        """
+        セルの表示値を決定する
+        
+        Args:
+            value: 表示する値(文字列または数値)
             
-            summary_row_id = items[-1]  # まとめ行
-            
-            # 該当する日付の行を検索
-            for row_id in items[:-2]:  # 日付行のみ対象
-                row_vals = list(self.tree.item(row_id, 'values'))
-                m = re.search(r'\d+', str(row_vals[0])) if row_vals else None
-                if m and int(m.group()) == d:
-                    # 列数を確認して必要に応じて拡張
-                    all_columns = self.get_all_columns()
-                    while len(row_vals) < len(all_columns) + 1:
-                        row_vals.append("")
-                    
-                    # 表示値をフォーマット(パディング付き)
-                    display_value = "  "
-                    if new_value and str(new_value).strip() != "" and str(new_value) != "0":
-                        display_value = f" {new_value} "
-                    
-                    # 値を更新
-                    row_vals[col_index] = display_value
-                    self.tree.item(row_id, values=row_vals)
-                    break
-            
-            # まとめ行(収入)の更新
-            if d == 0:
-                sum_vals = list(self.tree.item(summary_row_id, 'values'))
-                all_columns = self.get_all_columns()
-                while len(sum_vals) < len(all_columns) + 1:
-                    sum_vals.append("")
-                
-                display_value = "  "
-                if new_value and str(new_value).strip() != "" and str(new_value) != "0":
-                    display_value = f" {new_value} "
-                
-                sum_vals[col_index] = display_value
-                self.tree.item(summary_row_id, values=sum_vals)
-            
-            # 合計とまとめ行を再計算
-            self._update_totals()
+        Returns:
+            str: 表示用の文字列(空や0の場合はTreeviewConfig.EMPTY_CELL)
+        """
+        if value is None:
+            return TreeviewConfig.EMPTY_CELL
+        s = value if isinstance(value, str) else str(value)
+        if s == "0" or not s.strip():
+            return TreeviewConfig.EMPTY_CELL
+        return s
+    
+    def _flush_totals(self):
+        """予約された合計行とまとめ行の再計算を実行する"""
+        self._totals_dirty = False
+        self._update_totals()
 
     def _get_selected_cells(self):
         """
@@ -1220,56 +1561,50 @@ class MainWindow:
         通常選択：現在の行と列
         
         Returns:
-            list: [(row_id, col_id, day, col_idx), ...]
+            list: [(row_id, day, col_idx), ...]
         """
         selected_items = self.tree.selection()
         if not selected_items:
             return []
         
         cells = []
-        items = self.tree.get_children()
-        total_row_id = items[-2] if len(items) >= 2 else None
-        summary_row_id = items[-1] if len(items) >= 1 else None
-        all_columns = self.get_all_columns()
+        total_row_id = self._total_row_id
+        summary_row_id = self._summary_row_id
+        row_to_day = self._row_to_day
+        n_cols = len(self.get_all_columns())
         
         # Ctrl選択の場合：個別に記録されたセルを使用
         if self.ctrl_selected_cells and len(self.ctrl_selected_cells) > 1:
-            for row_id, col_id in self.ctrl_selected_cells:
+            for row_id, col_idx in self.ctrl_selected_cells:
                 # 合計行はスキップ
                 if row_id == total_row_id:
                     continue
                 
-                col_idx = int(col_id[1:]) - 1
-                
                 # 範囲チェック
-                if col_idx <= 0 or col_idx >= len(all_columns):
+                if col_idx <= 0 or col_idx >= n_cols:
                     continue
                 
                 # まとめ行の場合、収入列のみ許可
                 if row_id == summary_row_id:
                     if col_idx == 3:
-                        cells.append((row_id, col_id, 0, 3))
+                        cells.append((row_id, 0, 3))
                     continue
                 
                 # 日付を取得
-                row_vals = self.tree.item(row_id, 'values')
-                try:
-                    m = re.search(r'\d+', str(row_vals[0]))
-                    if not m:
-                        continue
-                    day = int(m.group())
-                except ValueError:
+                day = row_to_day.get(row_id)
+                if day is None:
                     continue
                 
-                cells.append((row_id, col_id, day, col_idx))
+                cells.append((row_id, day, col_idx))
             
             return cells
         
         # 範囲選択の場合（複数行が選択され、開始列が記録されている）
-        if len(selected_items) > 1 and self.selection_start_col and self.selected_column_id:
+        if (len(selected_items) > 1 and self.selection_start_col is not None
+                and self.selected_column_idx is not None):
             # 列の範囲を決定
-            start_col_idx = int(self.selection_start_col[1:]) - 1
-            end_col_idx = int(self.selected_column_id[1:]) - 1
+            start_col_idx = self.selection_start_col
+            end_col_idx = self.selected_column_idx
             
             # 正規化（小さい方が先）
             if start_col_idx > end_col_idx:
@@ -1281,31 +1616,24 @@ class MainWindow:
                 if row_id == total_row_id:
                     continue
                 
-                # 日付を取得
-                row_vals = self.tree.item(row_id, 'values')
-                
                 if row_id == summary_row_id:
                     # まとめ行は収入列(3)のみ
                     if start_col_idx <= 3 <= end_col_idx:
-                        cells.append((row_id, "#4", 0, 3))
+                        cells.append((row_id, 0, 3))
                     continue
                 
-                try:
-                    m = re.search(r'\d+', str(row_vals[0]))
-                    if not m:
-                        continue
-                    day = int(m.group())
-                except ValueError:
+                # 日付を取得
+                day = row_to_day.get(row_id)
+                if day is None:
                     continue
                 
                 # 列の範囲内のすべてのセルを追加
                 for col_idx in range(start_col_idx, end_col_idx + 1):
                     # 日付列と+列をスキップ
-                    if col_idx <= 0 or col_idx >= len(all_columns):
+                    if col_idx <= 0 or col_idx >= n_cols:
                         continue
                     
-                    col_id = f"#{col_idx + 1}"
-                    cells.append((row_id, col_id, day, col_idx))
+                    cells.append((row_id, day, col_idx))
         
         else:
             # 単一セルの場合
@@ -1315,13 +1643,13 @@ class MainWindow:
                     continue
                 
                 # 列IDがない場合はスキップ
-                if not self.selected_column_id:
+                if self.selected_column_idx is None:
                     continue
                 
-                col_idx = int(self.selected_column_id[1:]) - 1
+                col_idx = self.selected_column_idx
                 
                 # 範囲チェック
-                if col_idx <= 0 or col_idx >= len(all_columns):
+                if col_idx <= 0 or col_idx >= n_cols:
                     continue
                 
                 # まとめ行の場合、収入列のみ許可
@@ -1329,20 +1657,15 @@ class MainWindow:
                     continue
                 
                 # 日付を取得
-                row_vals = self.tree.item(row_id, 'values')
                 if row_id == summary_row_id:
                     day = 0
                     col_idx = 3  # 収入列
                 else:
-                    try:
-                        m = re.search(r'\d+', str(row_vals[0]))
-                        if not m:
-                            continue
-                        day = int(m.group())
-                    except ValueError:
+                    day = row_to_day.get(row_id)
+                    if day is None:
                         continue
                 
-                cells.append((row_id, self.selected_column_id, day, col_idx))
+                cells.append((row_id, day, col_idx))
         
         return cells
     
@@ -1354,27 +1677,30 @@ class MainWindow:
         if not cells:
             return
         
-        # データを収集
-        copy_data = []
-        for row_id, col_id, day, col_idx in cells:
-            dict_key = f"{self.current_year}-{self.current_month}-{day}-{col_idx}"
-            data_list = self.data_manager.get_transaction_data(dict_key)
+        # データを収集（取引データ部分はデータマネージャーがキャッシュしたJSON文字列を再利用）
+        get_json = self.data_manager.get_transaction_json
+        dumps = json.dumps
+        item = self.tree.item
+        y, m = self.current_year, self.current_month
+        row_values = {}  # 同じ行の複数セルで表示値の取得を1回にまとめる
+        copy_parts = []
+        for row_id, day, col_idx in cells:
+            dict_key = (y, m, day, col_idx)
             
             # セルの位置情報と合わせて保存
-            row_vals = self.tree.item(row_id, 'values')
-            copy_data.append({
-                'day': day,
-                'col_idx': col_idx,
-                'data': data_list if data_list else [],
-                'display_value': str(row_vals[col_idx]).strip() if col_idx < len(row_vals) else ""
-            })
+            row_vals = row_values.get(row_id)
+            if row_vals is None:
+                row_vals = row_values[row_id] = item(row_id, 'values')
+            display_value = str(row_vals[col_idx]) if col_idx < len(row_vals) else ""
+            copy_parts.append('{"day":%d,"col_idx":%d,"data":%s,"display_value":%s}' % (
+                day, col_idx, get_json(dict_key), dumps(display_value, ensure_ascii=False)))
         
         # JSON形式でクリップボードに保存
         self.root.clipboard_clear()
-        if copy_data:
-            json_str = json.dumps(copy_data, ensure_ascii=False)
+        if copy_parts:
+            json_str = "[" + ",".join(copy_parts) + "]"
             self.root.clipboard_append(json_str)
-            self.root.update()
+            self.root.update_idletasks()
     
     def _cut_cells(self, event=None):
         """
@@ -1385,24 +1711,30 @@ class MainWindow:
             return
         
         # Undo用に操作前の状態を保存
+        y, m = self.current_year, self.current_month
+        get_data = self.data_manager.get_transaction_data
         undo_data = []
-        for row_id, col_id, day, col_idx in cells:
-            dict_key = f"{self.current_year}-{self.current_month}-{day}-{col_idx}"
-            old_data = self.data_manager.get_transaction_data(dict_key)
-            undo_data.append((dict_key, old_data[:] if old_data else None))
+        for row_id, day, col_idx in cells:
+            dict_key = (y, m, day, col_idx)
+            undo_data.append((dict_key, get_data(dict_key) or None))
         
         self._save_undo_state('cut', undo_data)
         
         # まずコピー
         self._copy_cells()
         
-        # 次に削除
-        for row_id, col_id, day, col_idx in cells:
-            dict_key = f"{self.current_year}-{self.current_month}-{day}-{col_idx}"
-            self.data_manager.delete_transaction_data(dict_key)
-            
-            # UI更新
-            self.update_parent_cell(f"{self.current_year}-{self.current_month}-{day}", col_idx, "")
+        # 次に削除（表示の更新は行単位にまとめて反映）
+        delete_data = self.data_manager.delete_transaction_data
+        set_day_cell = self._set_day_cell
+        self._begin_bulk_update()
+        try:
+            for dict_key, _ in undo_data:
+                delete_data(dict_key)
+                
+                # UI更新
+                set_day_cell(dict_key[2], dict_key[3], "")
+        finally:
+            self._end_bulk_update()
     
     def _paste_cells(self, event=None):
         """
@@ -1422,9 +1754,10 @@ class MainWindow:
             return
         
         # 選択されたすべてのセルの中で最も左上のセルを見つける
-        items = self.tree.get_children()
-        summary_row_id = items[-1] if len(items) >= 1 else None
-        all_columns = self.get_all_columns()
+        row_pos = self._row_pos
+        row_to_day = self._row_to_day
+        summary_row_id = self._summary_row_id
+        n_cols = len(self.get_all_columns())
         
         base_day = None
         base_col_idx = None
@@ -1435,32 +1768,25 @@ class MainWindow:
             min_col_idx = float('inf')
             selected_row_id = None
             
-            for row_id, col_id in self.ctrl_selected_cells:
-                try:
-                    row_idx = items.index(row_id)
-                    col_idx = int(col_id[1:]) - 1
-                    
-                    # より上（行インデックスが小さい）、または同じ行でより左（列インデックスが小さい）
-                    if row_idx < min_row_idx or (row_idx == min_row_idx and col_idx < min_col_idx):
-                        min_row_idx = row_idx
-                        min_col_idx = col_idx
-                        selected_row_id = row_id
-                        base_col_idx = col_idx
-                except (ValueError, IndexError):
+            for row_id, col_idx in self.ctrl_selected_cells:
+                row_idx = row_pos.get(row_id)
+                if row_idx is None:
                     continue
+                
+                # より上（行インデックスが小さい）、または同じ行でより左（列インデックスが小さい）
+                if row_idx < min_row_idx or (row_idx == min_row_idx and col_idx < min_col_idx):
+                    min_row_idx = row_idx
+                    min_col_idx = col_idx
+                    selected_row_id = row_id
+                    base_col_idx = col_idx
             
             if selected_row_id:
-                row_vals = self.tree.item(selected_row_id, 'values')
                 if selected_row_id == summary_row_id:
                     base_day = 0
                     base_col_idx = 3  # 収入列
                 else:
-                    try:
-                        m = re.search(r'\d+', str(row_vals[0]))
-                        if not m:
-                            return
-                        base_day = int(m.group())
-                    except ValueError:
+                    base_day = row_to_day.get(selected_row_id)
+                    if base_day is None:
                         return
         
         # 範囲選択またはその他の場合
@@ -1470,63 +1796,59 @@ class MainWindow:
             selected_row_id = None
             
             for row_id in selected_items:
-                try:
-                    row_idx = items.index(row_id)
-                    if row_idx < min_row_idx:
-                        min_row_idx = row_idx
-                        selected_row_id = row_id
-                except ValueError:
-                    continue
+                row_idx = row_pos.get(row_id)
+                if row_idx is not None and row_idx < min_row_idx:
+                    min_row_idx = row_idx
+                    selected_row_id = row_id
             
             if not selected_row_id:
                 return
             
             # 列の決定
-            if self.selection_start_col and self.selected_column_id:
+            if self.selection_start_col is not None and self.selected_column_idx is not None:
                 # 範囲選択の場合、開始列と終了列の小さい方
-                start_col_idx = int(self.selection_start_col[1:]) - 1
-                end_col_idx = int(self.selected_column_id[1:]) - 1
-                base_col_idx = min(start_col_idx, end_col_idx)
-            elif self.selected_column_id:
+                base_col_idx = min(self.selection_start_col, self.selected_column_idx)
+            elif self.selected_column_idx is not None:
                 # 単一選択の場合
-                base_col_idx = int(self.selected_column_id[1:]) - 1
+                base_col_idx = self.selected_column_idx
             else:
                 return
             
             # 日付を取得
-            row_vals = self.tree.item(selected_row_id, 'values')
             if selected_row_id == summary_row_id:
                 base_day = 0
                 base_col_idx = 3  # 収入列
             else:
-                try:
-                    m = re.search(r'\d+', str(row_vals[0]))
-                    if not m:
-                        return
-                    base_day = int(m.group())
-                except ValueError:
+                base_day = row_to_day.get(selected_row_id)
+                if base_day is None:
                     return
         
-        # JSON形式のデータを解析
-        try:
-            paste_data = json.loads(clipboard_text)
-            if not isinstance(paste_data, list):
-                return
-        except json.JSONDecodeError:
+        # JSON形式のデータを解析（先頭文字がJSONの配列/オブジェクトの場合のみパースを試みる）
+        paste_data = None
+        stripped = clipboard_text.lstrip()
+        if stripped[:1] in ("[", "{"):
+            try:
+                paste_data = json.loads(stripped)
+            except json.JSONDecodeError:
+                pass
+        
+        if paste_data is not None and not isinstance(paste_data, list):
+            return
+        
+        if paste_data is None:
             # JSON形式でない場合は、単一セルとして扱う
             amount = parse_amount(clipboard_text)
             if amount != 0 or "0" in clipboard_text:
                 # Undo用に操作前の状態を保存
-                dict_key = f"{self.current_year}-{self.current_month}-{base_day}-{base_col_idx}"
+                dict_key = (self.current_year, self.current_month, base_day, base_col_idx)
                 old_data = self.data_manager.get_transaction_data(dict_key)
-                self._save_undo_state('paste', [(dict_key, old_data[:] if old_data else None)])
+                self._save_undo_state('paste', [(dict_key, old_data or None)])
                 
                 new_data_list = [("貼付入力", str(amount), "")]
                 
                 # 既存データの確認（上書き）
-                self.data_manager.set_transaction_data(dict_key, new_data_list)
-                total = sum(parse_amount(row[1]) for row in new_data_list if len(row) > 1)
-                self.update_parent_cell(f"{self.current_year}-{self.current_month}-{base_day}", base_col_idx, str(total))
+                total = self.data_manager.set_transaction_data(dict_key, new_data_list)
+                self._set_day_cell(base_day, base_col_idx, str(total))
             return
         
         # 複数セルの貼り付け：各セルの相対位置を保持
@@ -1539,11 +1861,11 @@ class MainWindow:
             
             if is_detail_window_data:
                 # 詳細入力ウィンドウからのデータを現在のセルに貼り付け
-                dict_key = f"{self.current_year}-{self.current_month}-{base_day}-{base_col_idx}"
+                dict_key = (self.current_year, self.current_month, base_day, base_col_idx)
                 old_data = self.data_manager.get_transaction_data(dict_key)
                 
                 # Undo用に元のデータを保存
-                self._save_undo_state('paste', [(dict_key, old_data[:] if old_data else None)])
+                self._save_undo_state('paste', [(dict_key, old_data or None)])
                 
                 # 詳細データとして保存
                 new_data_list = []
@@ -1556,48 +1878,52 @@ class MainWindow:
                         new_data_list.append(tuple(safe_row[:3]))
                 
                 if new_data_list:
-                    self.data_manager.set_transaction_data(dict_key, new_data_list)
-                    total = sum(parse_amount(row[1]) for row in new_data_list if len(row) > 1)
-                    self.update_parent_cell(f"{self.current_year}-{self.current_month}-{base_day}", base_col_idx, str(total))
+                    total = self.data_manager.set_transaction_data(dict_key, new_data_list)
+                    self._set_day_cell(base_day, base_col_idx, str(total))
             else:
                 # メインウィンドウからのデータ形式: [{"day": 1, "col_idx": 3, "data": [...]}, ...]
                 # コピー元の最小の日と列を見つける（基準点）
                 min_day = min(cell['day'] for cell in paste_data)
                 min_col = min(cell['col_idx'] for cell in paste_data)
                 
+                # 貼り付け先への移動量と範囲（ループ内で不変）
+                day_shift = base_day - min_day
+                col_shift = base_col_idx - min_col
                 days_in_month = self.get_days_in_month()
                 
                 # Undo用に影響を受けるすべてのセルの元データを保存
                 undo_data = []
                 
-                # 各セルを貼り付け
-                for cell_data in paste_data:
-                    # 元のセルの基準点からの相対位置を計算
-                    day_offset = cell_data['day'] - min_day
-                    col_offset = cell_data['col_idx'] - min_col
-                    
-                    # 貼り付け先の位置を計算
-                    target_day = base_day + day_offset
-                    target_col_idx = base_col_idx + col_offset
-                    
-                    # 範囲チェック
-                    if target_day < 0 or (target_day > days_in_month and target_day != 0):
-                        continue
-                    if target_col_idx <= 0 or target_col_idx >= len(all_columns):
-                        continue
-                    
-                    # Undo用に元のデータを保存
-                    dict_key = f"{self.current_year}-{self.current_month}-{target_day}-{target_col_idx}"
-                    old_data = self.data_manager.get_transaction_data(dict_key)
-                    undo_data.append((dict_key, old_data[:] if old_data else None))
-                    
-                    # データを貼り付け
-                    new_data = cell_data.get('data', [])
-                    
-                    if new_data:
-                        self.data_manager.set_transaction_data(dict_key, new_data)
-                        total = sum(parse_amount(row[1]) for row in new_data if len(row) > 1)
-                        self.update_parent_cell(f"{self.current_year}-{self.current_month}-{target_day}", target_col_idx, str(total))
+                # ループ内で使うメソッドと年月をローカル変数に束縛
+                y, m = self.current_year, self.current_month
+                get_data = self.data_manager.get_transaction_data
+                set_data = self.data_manager.set_transaction_data
+                set_day_cell = self._set_day_cell
+                
+                # 各セルを貼り付け（表示の更新は行単位にまとめて反映）
+                self._begin_bulk_update()
+                try:
+                    for cell_data in paste_data:
+                        # 貼り付け先の位置を計算（元のセルの基準点からの相対位置を保つ）
+                        target_day = cell_data['day'] + day_shift
+                        target_col_idx = cell_data['col_idx'] + col_shift
+                        
+                        # 範囲チェック（0はまとめ行、日付列と+列は対象外）
+                        if not (0 <= target_day <= days_in_month and 0 < target_col_idx < n_cols):
+                            continue
+                        
+                        # Undo用に元のデータを保存
+                        dict_key = (y, m, target_day, target_col_idx)
+                        undo_data.append((dict_key, get_data(dict_key) or None))
+                        
+                        # データを貼り付け
+                        new_data = cell_data.get('data', [])
+                        
+                        if new_data:
+                            total = set_data(dict_key, new_data)
+                            set_day_cell(target_day, target_col_idx, str(total))
+                finally:
+                    self._end_bulk_update()
                 
                 # Undo履歴に保存
                 if undo_data:
@@ -1612,20 +1938,27 @@ class MainWindow:
             return
         
         # Undo用に操作前の状態を保存
+        y, m = self.current_year, self.current_month
+        get_data = self.data_manager.get_transaction_data
         undo_data = []
-        for row_id, col_id, day, col_idx in cells:
-            dict_key = f"{self.current_year}-{self.current_month}-{day}-{col_idx}"
-            old_data = self.data_manager.get_transaction_data(dict_key)
-            undo_data.append((dict_key, old_data[:] if old_data else None))
+        for row_id, day, col_idx in cells:
+            dict_key = (y, m, day, col_idx)
+            undo_data.append((dict_key, get_data(dict_key) or None))
         
         self._save_undo_state('delete', undo_data)
         
-        for row_id, col_id, day, col_idx in cells:
-            dict_key = f"{self.current_year}-{self.current_month}-{day}-{col_idx}"
-            self.data_manager.delete_transaction_data(dict_key)
-            
-            # UI更新
-            self.update_parent_cell(f"{self.current_year}-{self.current_month}-{day}", col_idx, "")
+        # 表示の更新は行単位にまとめて反映
+        delete_data = self.data_manager.delete_transaction_data
+        set_day_cell = self._set_day_cell
+        self._begin_bulk_update()
+        try:
+            for dict_key, _ in undo_data:
+                delete_data(dict_key)
+                
+                # UI更新
+                set_day_cell(dict_key[2], dict_key[3], "")
+        finally:
+            self._end_bulk_update()
 
     def _save_undo_state(self, action_type, cells_data):
         """
@@ -1643,10 +1976,6 @@ class MainWindow:
         }
         
         self.undo_stack.append(undo_entry)
-        
-        # 最大保持数を超えたら古いものから削除
-        if len(self.undo_stack) > self.max_undo_count:
-            self.undo_stack.pop(0)
     
     def _undo(self, event=None):
         """
@@ -1661,41 +1990,33 @@ class MainWindow:
         year = undo_entry['year']
         month = undo_entry['month']
         
-        # 年月が異なる場合は表示を切り替え
-        if self.current_year != year or self.current_month != month:
-            self.current_year = year
-            self.current_month = month
-            self.update_year_display()
-            self._update_month_buttons()
-            self._show_month(self.current_month)
-        
-        if action == 'cut' or action == 'delete':
-            # 切り取り/削除の取り消し：データを復元
-            for dict_key, old_data in cells:
-                if old_data:
-                    self.data_manager.set_transaction_data(dict_key, old_data)
-                    # UI更新
-                    parts = dict_key.split('-')
-                    if len(parts) == 4:
-                        y, m, d, col_idx = int(parts[0]), int(parts[1]), int(parts[2]), int(parts[3])
-                        total = sum(parse_amount(row[1]) for row in old_data if len(row) > 1)
-                        self.update_parent_cell(f"{y}-{m}-{d}", col_idx, str(total))
-        
-        elif action == 'paste' or action == 'edit_detail':
-            # 貼り付け/詳細編集の取り消し：貼り付けたデータを削除し、元のデータを復元
-            for dict_key, old_data in cells:
-                if old_data is None:
-                    # 元々データがなかった場合は削除
-                    self.data_manager.delete_transaction_data(dict_key)
-                    parts = dict_key.split('-')
-                    if len(parts) == 4:
-                        y, m, d, col_idx = int(parts[0]), int(parts[1]), int(parts[2]), int(parts[3])
-                        self.update_parent_cell(f"{y}-{m}-{d}", col_idx, "")
-                else:
-                    # 元のデータがあった場合は復元
-                    self.data_manager.set_transaction_data(dict_key, old_data)
-                    parts = dict_key.split('-')
-                    if len(parts) == 4:
-                        y, m, d, col_idx = int(parts[0]), int(parts[1]), int(parts[2]), int(parts[3])
-                        total = sum(parse_amount(row[1]) for row in old_data if len(row) > 1)
-                        self.update_parent_cell(f"{y}-{m}-{d}", col_idx, str(total))
\ No newline at end of file
+        # 年月が異なる場合は表示を切り替え（予約中の前月/翌月の移動も取り消す）
+        self.navigate_to(year, month)
+        
+        # 表示はすでに対象の年月なので、セルの更新は行単位にまとめて反映する
+        set_data = self.data_manager.set_transaction_data
+        delete_data = self.data_manager.delete_transaction_data
+        set_day_cell = self._set_day_cell
+        self._begin_bulk_update()
+        try:
+            if action == 'cut' or action == 'delete':
+                # 切り取り/削除の取り消し：データを復元
+                for dict_key, old_data in cells:
+                    if old_data:
+                        total = set_data(dict_key, old_data)
+                        # UI更新
+                        set_day_cell(dict_key[2], dict_key[3], str(total))
+            
+            elif action == 'paste' or action == 'edit_detail':
+                # 貼り付け/詳細編集の取り消し：貼り付けたデータを削除し、元のデータを復元
+                for dict_key, old_data in cells:
+                    if old_data is None:
+                        # 元々データがなかった場合は削除
+                        delete_data(dict_key)
+                        set_day_cell(dict_key[2], dict_key[3], "")
+                    else:
+                        # 元のデータがあった場合は復元
+                        total = set_data(dict_key, old_data)
+                        set_day_cell(dict_key[2], dict_key[3], str(total))
+        finally:
+            self._end_bulk_update()
\ No newline at end of file
@@ -5,6 +5,7 @@
 import tkinter as tk
 from tkinter import ttk
 from ui.base_dialog import BaseDialog
+from ui.result_row import ResultRow, SORT_KEY_MAP
 from config import parse_amount
 
 
@@ -31,8 +32,11 @@ class MonthlyDataDialog(BaseDialog):
         self.year = year
         self.month = month
         self.monthly_data = []
+        self.row_iids = []  # monthly_dataの各要素に対応するTreeviewの行ID
+        self.iid_to_row = {}  # Treeviewの行ID -> 表示中の行データ（ソートしても変わらない）
         self.sort_column = None
         self.sort_reverse = False
+        self.header_sort_column = None  # ヘッダーに矢印を表示している列
         
         super().__init__(parent, f"月間データ詳細 - {year}年{month:02d}月")
         
@@ -149,19 +153,16 @@ class MonthlyDataDialog(BaseDialog):
         if not item:
             return
         
-        row_index = self.result_tree.index(item[0])
-        if row_index >= len(self.monthly_data):
+        # 行IDから行データを直接取得（Treeviewへの問い合わせを行わない）
+        data = self.iid_to_row.get(item[0])
+        if data is None:
             return
         
-        data = self.monthly_data[row_index]
-        year, month, day, col_index = data['sort_key']
+        year, month, day, col_index = data.sort_key
         
         # 親アプリケーションの年月を変更
-        if self.parent_app.current_year != year or self.parent_app.current_month != month:
-            self.parent_app.current_year = year
-            self.parent_app.current_month = month
-            self.parent_app.update_year_display()
-            self.parent_app.select_month(month)
+        # 予約中の前月/翌月の移動も取り消されるよう、常にnavigate_toを通す
+        self.parent_app.navigate_to(year, month)
         
         # 該当する行とセルに移動
         self._navigate_to_cell(day, col_index)
@@ -175,20 +176,8 @@ class MonthlyDataDialog(BaseDialog):
         if not self.parent_app.tree:
             return
         
-        items = self.parent_app.tree.get_children()
-        if not items:
-            return
-        
-        target_item = None
-        
-        if day == 0:
-            target_item = items[-1]
-        else:
-            for item in items[:-2]:
-                values = self.parent_app.tree.item(item, 'values')
-                if values and str(values[0]).strip() == str(day):
-                    target_item = item
-                    break
+        # 日付から行IDを直接取得（行ごとに値を読み出して探さない）
+        target_item = self.parent_app.get_day_row_id(day)
         
         if target_item:
             self.parent_app.tree.selection_set(target_item)
@@ -203,138 +192,110 @@ class MonthlyDataDialog(BaseDialog):
             self.sort_column = column
             self.sort_reverse = False
         
-        sort_key_map = {
-            "年月日": lambda x: x['sort_key'],
-            "項目": lambda x: x['column'],
-            "支払先": lambda x: x['partner'],
-            "金額(円)": lambda x: x['amount_value'],
-            "メモ": lambda x: x['detail']
-        }
+        # 並べ替え順を求め、データと行IDを同じ順に並べ替える
+        key = SORT_KEY_MAP.get(column, lambda x: "")
+        data = self.monthly_data
+        order = sorted(range(len(data)), key=lambda i: key(data[i]), reverse=self.sort_reverse)
+        self.monthly_data = [data[i] for i in order]
+        self.row_iids = [self.row_iids[i] for i in order]
         
-        self.monthly_data.sort(key=sort_key_map.get(column, lambda x: ""),
-                               reverse=self.sort_reverse)
+        # 行を削除・再作成せず、既存の行を移動する（重複のタグもそのまま保持される）
+        move = self.result_tree.move
+        for index, item_id in enumerate(self.row_iids):
+            move(item_id, "", index)
         
-        self._refresh_treeview()
         self._update_column_headers()
     
     def _refresh_treeview(self):
         """ソート後のデータでTreeviewを再表示する"""
-        for item in self.result_tree.get_children():
-            self.result_tree.delete(item)
+        tree = self.result_tree
+        # 既存のアイテムは1回の呼び出しでまとめて削除
+        tree.delete(*tree.get_children())
         
-        for result in self.monthly_data:
-            values = [result['date'], result['column'], result['partner'],
-                      result['amount'], result['detail']]
-            self.result_tree.insert("", "end", values=values)
+        insert = tree.insert
+        self.row_iids = [insert("", "end", values=result.values()) for result in self.monthly_data]
+        self.iid_to_row = dict(zip(self.row_iids, self.monthly_data))
         
         self._highlight_duplicates()
         self.result_label.config(text=f"データ: {len(self.monthly_data)} 件")
     
     def _update_column_headers(self):
-        """ソート状態を示すため、列ヘッダーに矢印を表示する"""
-        columns = ["年月日", "項目", "支払先", "金額(円)", "メモ"]
+        """
+        ソート状態を示すため、列ヘッダーに矢印を表示する
         
-        for col in columns:
-            if col == self.sort_column:
-                arrow = " ▼" if self.sort_reverse else " ▲"
-                self.result_tree.heading(col, text=f"{col}{arrow}")
-            else:
-                self.result_tree.heading(col, text=col)
+        表示が変わるのは前回のソート列と今回のソート列だけなので、
+        その2列のヘッダーのみを更新する。
+        """
+        prev = self.header_sort_column
+        if prev is not None and prev != self.sort_column:
+            self.result_tree.heading(prev, text=prev)
+        
+        if self.sort_column is not None:
+            arrow = " ▼" if self.sort_reverse else " ▲"
+            self.result_tree.heading(self.sort_column, text=f"{self.sort_column}{arrow}")
+        self.header_sort_column = self.sort_column
     
     def _highlight_duplicates(self):
-        """重複データを検出して薄い赤色でハイライトする（最適化版）"""
-        items = self.result_tree.get_children()
+        """
+        重複データを検出して薄い赤色でハイライトする
+        
+        Treeviewから値を読み戻さず、表示元のmonthly_dataで重複を判定し、
+        重複している行にだけタグを設定する。
+        """
         seen_data = {}
+        for result, item_id in zip(self.monthly_data, self.row_iids):
+            data_key = result.values()
+            seen_data.setdefault(data_key, []).append(item_id)
         
-        # 1回のループで重複検出（2回ループを1回に削減して効率化）
-        for item in items:
-            values = self.result_tree.item(item, 'values')
-            if not values:
-                continue
-            
-            # タプルで直接比較（不要な文字列化を削減）
-            data_key = tuple(values[:5])
-            
-            if data_key in seen_data:
-                seen_data[data_key].append(item)
-            else:
-                seen_data[data_key] = [item]
-        
-        # 重複しているアイテムにタグを設定
+        # 重複しているアイテムにタグを設定（挿入時はタグなしのため読み取り不要）
+        item = self.result_tree.item
         for item_list in seen_data.values():
             if len(item_list) > 1:
                 for item_id in item_list:
-                    current_tags = self.result_tree.item(item_id, 'tags')
-                    
-                    if isinstance(current_tags, str):
-                        tag_list = [current_tags] if current_tags else []
-                    else:
-                        tag_list = list(current_tags) if current_tags else []
-
-                    # duplicateタグを追加
-                    if "duplicate" not in tag_list:
-                        tag_list.append("duplicate")
-
-                    # タグをタプルとして設定（Treeviewが期待する形式）
-                    self.result_tree.item(item_id, tags=tuple(tag_list))
+                    item(item_id, tags=("duplicate",))
 
     def _load_monthly_data(self):
         """
         指定された年月のデータを読み込む。
         """
-        # 既存の表示をクリア
-        for item in self.result_tree.get_children():
-            self.result_tree.delete(item)
-
         self.monthly_data = []
         total_amount = 0  # 月間合計金額
         total_count = 0  # 取引件数
 
-        # データ取得元を data_manager に変更
-        for dict_key, data_list in self.parent_app.data_manager.data.items():
+        # 指定された年月のキーだけを索引から取得（全データの走査を避ける）
+        data_manager = self.parent_app.data_manager
+        data = data_manager.data
+        all_columns = self.parent_app.get_all_columns()
+        for dict_key in data_manager.get_month_keys(self.year, self.month):
             try:
-                # キーを解析（形式: "年-月-日-列インデックス"）
-                parts = dict_key.split("-")
-                if len(parts) == 4:
-                    year = int(parts[0])
-                    month = int(parts[1])
-                    day = int(parts[2])
-                    col_index = int(parts[3])
+                # キーを展開（形式: (年, 月, 日, 列インデックス)）
+                year, month, day, col_index = dict_key
+                data_list = data[dict_key]
 
-                    # まとめ行（day=0）は収入データなので除外
-                    if day == 0:
-                        continue
+                # まとめ行（day=0）は収入データなので除外
+                if day == 0:
+                    continue
 
-                    # 指定された年月のデータのみ処理
-                    if year == self.year and month == self.month:
-                        # 項目名を取得
-                        all_columns = self.parent_app.get_all_columns()
-                        column_name = all_columns[col_index] if col_index < len(all_columns) else f"列{col_index}"
-                        date_str = f"{year}/{month:02d}/{day:02d}"
+                # 項目名を取得
+                column_name = all_columns[col_index] if col_index < len(all_columns) else f"列{col_index}"
+                date_str = f"{year}/{month:02d}/{day:02d}"
 
-                        # 各取引データを処理
-                        for row in data_list:
-                            if len(row) >= 3:
-                                partner = str(row[0]).strip() if row[0] else ""
-                                amount_str = str(row[1]).strip() if row[1] else ""
-                                detail = str(row[2]).strip() if row[2] else ""
+                # 各取引データを処理
+                for row in data_list:
+                    if len(row) >= 3:
+                        partner = str(row[0]).strip() if row[0] else ""
+                        amount_str = str(row[1]).strip() if row[1] else ""
+                        detail = str(row[2]).strip() if row[2] else ""
 
-                                # 【修正箇所】ここです！ self._parse_amount ではなく parse_amount を使います
-                                amount_value = parse_amount(amount_str)
+                        # 【修正箇所】ここです！ self._parse_amount ではなく parse_amount を使います
+                        amount_value = parse_amount(amount_str)
 
-                                # 結果データを構造化
-                                result = {
-                                    'date': date_str,
-                                    'column': column_name,
-                                    'partner': partner,
-                                    'amount': amount_str,
-                                    'detail': detail,
-                                    'amount_value': amount_value,
-                                    'sort_key': (year, month, day, col_index)
-                                }
-                                self.monthly_data.append(result)
-                                total_amount += amount_value
-                                total_count += 1
+                        # 結果データを構造化
+                        result = ResultRow(date_str, column_name, partner, amount_str, detail,
+                                           amount_value, dict_key)
+                        self.monthly_data.append(result)
+                        total_amount += amount_value
+                        total_count += 1
             except (ValueError, IndexError):
                 continue
             except Exception as e:
@@ -343,18 +304,12 @@ class MonthlyDataDialog(BaseDialog):
                 continue
 
         # デフォルトで日付順にソート
-        self.monthly_data.sort(key=lambda x: x['sort_key'])
+        self.monthly_data.sort(key=SORT_KEY_MAP["年月日"])
         self.sort_column = "年月日"
         self.sort_reverse = False
 
-        # データをTreeviewに表示
-        for result in self.monthly_data:
-            values = [result['date'], result['column'], result['partner'],
-                      result['amount'], result['detail']]
-            self.result_tree.insert("", "end", values=values)
-
-        # 重複データをチェックしてハイライト
-        self._highlight_duplicates()
+        # データをTreeviewに表示(重複データのハイライトと件数表示を含む)
+        self._refresh_treeview()
 
         # 列ヘッダーを更新
         self._update_column_headers()
@@ -364,7 +319,4 @@ class MonthlyDataDialog(BaseDialog):
             avg_amount = total_amount / total_count
             self.stats_label.config(text=f"合計金額: ¥{total_amount:,} | 平均金額: ¥{avg_amount:.0f}")
         else:
-            self.stats_label.config(text="データなし")
-
-        # データ件数を表示
-        self.result_label.config(text=f"データ: {len(self.monthly_data)} 件")
\ No newline at end of file
+            self.stats_label.config(text="データなし")
\ No newline at end of file
@@ -0,0 +1,56 @@
+# ui/result_row.py
+"""
+一覧ダイアログ（検索・月間データ）で表示する1行分の取引データ
+"""
+from operator import attrgetter
+
+
+class ResultRow:
+    """
+    一覧表示用の取引データ1行分を保持するクラス。
+
+    行数が多くなっても使用メモリを抑えられるよう __slots__ を使用し、
+    ソート時は operator.attrgetter で属性を直接参照できるようにする。
+    """
+
+    __slots__ = ('date', 'column', 'partner', 'amount', 'detail', 'amount_value', 'sort_key')
+
+    def __init__(self, date, column, partner, amount, detail, amount_value, sort_key):
+        """
+        行データを初期化する。
+
+        Args:
+            date: 表示用の日付文字列
+            column: 項目名
+            partner: 支払先
+            amount: 表示用の金額文字列
+            detail: メモ
+            amount_value: 数値化した金額（ソート・集計用）
+            sort_key: (年, 月, 日, 列インデックス) のタプル
+        """
+        self.date = date
+        self.column = column
+        self.partner = partner
+        self.amount = amount
+        self.detail = detail
+        self.amount_value = amount_value
+        self.sort_key = sort_key
+
+    def values(self):
+        """
+        Treeviewに表示する値を返す
+
+        Returns:
+            tuple: (年月日, 項目, 支払先, 金額, メモ)
+        """
+        return (self.date, self.column, self.partner, self.amount, self.detail)
+
+
+# 列名ごとのソートキー（ソートのたびに作り直さないようモジュールで1度だけ作成）
+SORT_KEY_MAP = {
+    "年月日": attrgetter('sort_key'),
+    "項目": attrgetter('column'),
+    "支払先": attrgetter('partner'),
+    "金額(円)": attrgetter('amount_value'),
+    "メモ": attrgetter('detail')
+}
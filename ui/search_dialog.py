@@ -5,7 +5,7 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
 from ui.base_dialog import BaseDialog
-from config import parse_amount
+from ui.result_row import ResultRow, SORT_KEY_MAP
 
 
 class SearchDialog(BaseDialog):
@@ -27,6 +27,8 @@ class SearchDialog(BaseDialog):
         """
         self.parent_app = parent_app
         self.search_results = []
+        self.row_iids = []  # search_resultsの各要素に対応するTreeviewの行ID
+        self.iid_to_row = {}  # Treeviewの行ID -> 表示中の行データ（ソートしても変わらない）
         
         super().__init__(parent, "検索")
         
@@ -86,6 +88,7 @@ class SearchDialog(BaseDialog):
 
         self.sort_column = None
         self.sort_reverse = False
+        self.header_sort_column = None  # ヘッダーに矢印を表示している列
         
         for col in columns:
             self.result_tree.heading(col, text=col, command=lambda c=col: self._sort_by_column(c))
@@ -145,49 +148,49 @@ class SearchDialog(BaseDialog):
             self.sort_column = column
             self.sort_reverse = False
         
-        # ソートキーのマッピング
-        sort_key_map = {
-            "年月日": lambda x: (x['year'], x['month'], x['day']),
-            "項目": lambda x: x['column'],
-            "支払先": lambda x: x['partner'],
-            "金額(円)": lambda x: parse_amount(x['amount']),
-            "メモ": lambda x: x['detail']
-        }
-        
-        # データをソート
-        self.search_results.sort(key=sort_key_map.get(column, lambda x: ""),
-                                reverse=self.sort_reverse)
+        # 並べ替え順を求め、データと行IDを同じ順に並べ替える
+        key = SORT_KEY_MAP.get(column, lambda x: "")
+        data = self.search_results
+        order = sorted(range(len(data)), key=lambda i: key(data[i]), reverse=self.sort_reverse)
+        self.search_results = [data[i] for i in order]
+        self.row_iids = [self.row_iids[i] for i in order]
         
-        # Treeviewを更新
-        self._refresh_treeview()
+        # 行を削除・再作成せず、既存の行を移動する
+        move = self.result_tree.move
+        for index, item_id in enumerate(self.row_iids):
+            move(item_id, "", index)
         
         # 列ヘッダーを更新（ソート方向を表示）
         self._update_column_headers()
     
     def _refresh_treeview(self):
         """ソート後のデータでTreeviewを再表示する"""
-        # 既存のアイテムをクリア
-        for item in self.result_tree.get_children():
-            self.result_tree.delete(item)
+        tree = self.result_tree
+        # 既存のアイテムは1回の呼び出しでまとめて削除
+        tree.delete(*tree.get_children())
         
         # ソート済みデータを再表示
-        for result in self.search_results:
-            values = [result['date'], result['column'], result['partner'],
-                      result['amount'], result['detail']]
-            self.result_tree.insert("", "end", values=values)
+        insert = tree.insert
+        self.row_iids = [insert("", "end", values=result.values()) for result in self.search_results]
+        self.iid_to_row = dict(zip(self.row_iids, self.search_results))
     
     def _update_column_headers(self):
-        """ソート状態を示すため、列ヘッダーに矢印を表示する"""
-        columns = ["年月日", "項目", "支払先", "金額(円)", "メモ"]
+        """
+        ソート状態を示すため、列ヘッダーに矢印を表示する
         
-        for col in columns:
-            if col == self.sort_column:
-                # ソート中の列には矢印を表示
-                arrow = " ▼" if self.sort_reverse else " ▲"
-                self.result_tree.heading(col, text=f"{col}{arrow}")
-            else:
-                # その他の列は通常表示
-                self.result_tree.heading(col, text=col)
+        表示が変わるのは前回のソート列と今回のソート列だけなので、
+        その2列のヘッダーのみを更新する。
+        """
+        prev = self.header_sort_column
+        if prev is not None and prev != self.sort_column:
+            # 前回のソート列は通常表示に戻す
+            self.result_tree.heading(prev, text=prev)
+        
+        if self.sort_column is not None:
+            # ソート中の列には矢印を表示
+            arrow = " ▼" if self.sort_reverse else " ▲"
+            self.result_tree.heading(self.sort_column, text=f"{self.sort_column}{arrow}")
+        self.header_sort_column = self.sort_column
     
     def _on_header_right_click(self, event):
         """ヘッダーの右クリックイベントを処理する"""
@@ -223,27 +226,16 @@ class SearchDialog(BaseDialog):
         if not item:
             return
         
-        try:
-            all_items = self.result_tree.get_children()
-            row_index = all_items.index(item[0])
-        except (ValueError, IndexError):
+        # 行IDから行データを直接取得（Treeviewの全行を取得して探さない）
+        data = self.iid_to_row.get(item[0])
+        if data is None:
             return
         
-        if row_index >= len(self.search_results):
-            return
-        
-        data = self.search_results[row_index]
-        year = data['year']
-        month = data['month']
-        day = data['day']
-        col_index = data['col_index']
+        year, month, day, col_index = data.sort_key
         
         # 親アプリケーションの年月を変更
-        if self.parent_app.current_year != year or self.parent_app.current_month != month:
-            self.parent_app.current_year = year
-            self.parent_app.current_month = month
-            self.parent_app.update_year_display()
-            self.parent_app.select_month(month)
+        # 予約中の前月/翌月の移動も取り消されるよう、常にnavigate_toを通す
+        self.parent_app.navigate_to(year, month)
         
         # 該当する行とセルに移動
         self._navigate_to_cell(day, col_index)
@@ -253,20 +245,8 @@ class SearchDialog(BaseDialog):
         if not self.parent_app.tree:
             return
         
-        items = self.parent_app.tree.get_children()
-        if not items:
-            return
-        
-        target_item = None
-        
-        if day == 0:
-            target_item = items[-1]
-        else:
-            for item in items[:-2]:
-                values = self.parent_app.tree.item(item, 'values')
-                if values and str(values[0]).strip() == str(day):
-                    target_item = item
-                    break
+        # 日付から行IDを直接取得（行ごとに値を読み出して探さない）
+        target_item = self.parent_app.get_day_row_id(day)
         
         if target_item:
             self.parent_app.tree.selection_set(target_item)
@@ -280,10 +260,6 @@ class SearchDialog(BaseDialog):
             messagebox.showwarning("警告", "検索文字列を入力してください。")
             return
         
-        # 前回の検索結果をクリア
-        for item in self.result_tree.get_children():
-            self.result_tree.delete(item)
-        
         self.search_results = []
         
         # データマネージャーから検索
@@ -308,32 +284,19 @@ class SearchDialog(BaseDialog):
                 column_name = f"列{col_index}"
 
             # 金額の加算（統計計算をループ内で実行して二重ループを回避・効率化）
-            amount_val = parse_amount(result['amount'])
+            amount_val = result['amount_value']
             total_amount += amount_val
             
-            search_result = {
-                'year': year,
-                'month': month,
-                'day': day,
-                'col_index': col_index,
-                'date': date_str,
-                'column': column_name,
-                'partner': result['partner'],
-                'amount': result['amount'],
-                'detail': result['detail']
-            }
+            search_result = ResultRow(date_str, column_name, result['partner'], result['amount'],
+                                      result['detail'], amount_val, (year, month, day, col_index))
             self.search_results.append(search_result)
         
-        # 結果を日付順にソート（デフォルト）
+        # 結果はデータマネージャー側で日付順に並んでいる（デフォルト）
         self.sort_column = "年月日"
         self.sort_reverse = False
-        self.search_results.sort(key=lambda x: (x['year'], x['month'], x['day'], x['col_index']))
         
-        # 結果を表示
-        for result in self.search_results:
-            values = [result['date'], result['column'], result['partner'],
-                      result['amount'], result['detail']]
-            self.result_tree.insert("", "end", values=values)
+        # 結果を表示(前回の検索結果はここでまとめてクリアされる)
+        self._refresh_treeview()
         
         # 列ヘッダーを更新
         self._update_column_headers()
@@ -351,10 +314,11 @@ class SearchDialog(BaseDialog):
     
     def _clear_results(self):
         """検索結果と入力フィールドをクリアする"""
-        for item in self.result_tree.get_children():
-            self.result_tree.delete(item)
+        self.result_tree.delete(*self.result_tree.get_children())
         
         self.search_results = []
+        self.row_iids = []
+        self.iid_to_row = {}
         self.result_label.config(text="検索結果: 0 件")
         self.stats_label.config(text="")
         self.search_entry.delete(0, tk.END)
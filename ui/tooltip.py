@@ -3,7 +3,7 @@
 Treeview用のツールチップ機能
 """
 import tkinter as tk
-from config import parse_amount
+from config import TreeviewConfig
 
 
 class TreeviewTooltip:
@@ -25,15 +25,65 @@ class TreeviewTooltip:
         self.treeview = treeview
         self.parent_app = parent_app
         self.tooltip_window = None
+        self.tooltip_label = None
+        self._tooltip_visible = False
         self.current_item = None
         self.current_column = None
+        self._pending_after = None  # 予約中のツールチップ判定のafter ID
+        self._pending_event = None  # 最後に受け取ったマウス移動イベント
+        self._paused = False  # ダイアログ表示中など、ツールチップを止めている間はTrue
         
         # マウスイベントをバインド
         self.treeview.bind('<Motion>', self._on_mouse_motion)
         self.treeview.bind('<Leave>', self._on_mouse_leave)
     
     def _on_mouse_motion(self, event):
-        """マウスがTreeview上で移動した時の処理"""
+        """
+        マウスがTreeview上で移動した時の処理
+        
+        移動のたびにセルの判定や集計を行わないよう、判定は予約だけして
+        マウスが止まった時に1回だけ実行する。
+        """
+        if self._paused:
+            return
+        self._pending_event = event
+        self._cancel_pending()
+        self._pending_after = self.treeview.after(TreeviewConfig.TOOLTIP_DELAY_MS,
+                                                  self._resolve_tooltip)
+    
+    def pause(self):
+        """ツールチップを非表示にし、resumeが呼ばれるまでマウス移動を無視する"""
+        self._paused = True
+        self._pending_event = None
+        self._hide_tooltip()
+    
+    def resume(self):
+        """pauseで止めたツールチップの表示を再開する"""
+        self._paused = False
+    
+    def reset(self):
+        """
+        表示中のツールチップを隠し、次のマウス移動でセルを判定し直させる
+        
+        行IDは月の切り替えやセルの更新後も再利用されるため、
+        表示内容が変わった時に呼び出す。
+        """
+        self._hide_tooltip()
+    
+    def _cancel_pending(self):
+        """予約中のツールチップ判定を取り消す"""
+        if self._pending_after is not None:
+            self.treeview.after_cancel(self._pending_after)
+            self._pending_after = None
+    
+    def _resolve_tooltip(self):
+        """最後のマウス位置のセルに応じてツールチップを表示する"""
+        self._pending_after = None
+        event = self._pending_event
+        # 予約後にTreeviewが再作成された場合は何もしない
+        if event is None or not self.treeview.winfo_exists():
+            return
+        
         item = self.treeview.identify_row(event.y)
         column = self.treeview.identify_column(event.x)
         
@@ -54,27 +104,32 @@ class TreeviewTooltip:
             self._hide_tooltip()
             return
         
+        # ほとんどのセルは空か0なので、行の判定より先にセルの値で打ち切る
         row_values = self.treeview.item(item, 'values')
-        if not row_values:
+        if col_index >= len(row_values):
             self._hide_tooltip()
             return
         
-        cell_value = str(row_values[col_index]).strip() if col_index < len(row_values) else ""
+        # Treeviewは数値に見える値を数値で返すため、文字列の場合のみ空白を除去する
+        cell_value = row_values[col_index]
+        if isinstance(cell_value, str):
+            cell_value = cell_value.strip()
         if not cell_value or cell_value == "0":
             self._hide_tooltip()
             return
         
-        items = self.treeview.get_children()
-        if len(items) < 2:
-            self._hide_tooltip()
+        # 合計行・まとめ行はメイン画面が保持している行IDで判定する
+        # （Treeviewの全行を取得して末尾の2行を調べない）
+        if item == self.parent_app.get_total_row_id():
+            self._show_total_tooltip(event, col_index)
             return
         
-        total_row_id = items[-2]
-        summary_row_id = items[-1]
-        
-        if item == total_row_id:
-            self._show_total_tooltip(event, col_index)
-        elif item == summary_row_id:
+        # 日付列の表示（例: "12(火)"）を解析せず、行IDから日を直接取得
+        day = self.parent_app.get_row_day(item)
+        if day is None:
+            self._hide_tooltip()
+        elif day == 0:
+            # まとめ行
             if col_index == 3:
                 self._show_income_tooltip(event)
             elif col_index == 5:
@@ -82,48 +137,30 @@ class TreeviewTooltip:
             else:
                 self._hide_tooltip()
         else:
-            import re
-            try:
-                m = re.search(r'\d+', str(row_values[0]))
-                if not m:
-                    self._hide_tooltip()
-                    return
-                day = int(m.group())
-                self._show_detail_tooltip(event, day, col_index)
-            except ValueError:
-                self._hide_tooltip()
+            self._show_detail_tooltip(event, day, col_index)
     
     def _show_detail_tooltip(self, event, day, col_index):
         """通常セルの詳細情報をツールチップで表示"""
-        dict_key = f"{self.parent_app.current_year}-{self.parent_app.current_month}-{day}-{col_index}"
-        data_list = self.parent_app.data_manager.get_transaction_data(dict_key)
+        dict_key = (self.parent_app.current_year, self.parent_app.current_month, day, col_index)
+        # 整形・金額解析済みの行を使用（表示のたびに文字列を整形し直さない）
+        rows = self.parent_app.data_manager.get_normalized_rows(dict_key)
         
-        if not data_list:
+        if not rows:
             self._hide_tooltip()
             return
         
         lines = []
+        append = lines.append  # ループ内でメソッドを引き直さないようローカルに束縛
         total = 0
         
-        for row in data_list:
-            if len(row) >= 3:
-                partner = str(row[0]).strip() if row[0] else "(未入力)"
-                amount_str = str(row[1]).strip() if row[1] else "0"
-                detail = str(row[2]).strip() if row[2] else ""
-                
-                try:
-                    amount = parse_amount(amount_str)
-                    total += amount
-                    amount_display = f"¥{amount:,}"
-                except ValueError:
-                    amount_display = amount_str
-                
-                line = f"• {partner}: {amount_display}"
-                if detail:
-                    line += f" ({detail})"
-                lines.append(line)
-        
-        if len(data_list) > 1:
+        for partner, _, detail, _, amount in rows:
+            partner = partner or "(未入力)"
+            total += amount
+            # 詳細の有無にかかわらず1行を1回の書式化で作成する
+            append(f"• {partner}: ¥{amount:,} ({detail})" if detail
+                   else f"• {partner}: ¥{amount:,}")
+        
+        if len(rows) > 1:
             lines.append("─" * 30)
             lines.append(f"合計: ¥{total:,}")
         
@@ -135,17 +172,24 @@ class TreeviewTooltip:
         column_name = all_columns[col_index] if col_index < len(all_columns) else "不明"
         
         days_with_data = []
+        add_day = days_with_data.append
         total = 0
-        days_in_month = self.parent_app.get_days_in_month()
+        data_manager = self.parent_app.data_manager
+        # 金額の合計はデータマネージャーのキャッシュを使用（金額文字列を解析し直さない）
+        get_amount_total = data_manager.get_amount_total
         
-        for day in range(1, days_in_month + 1):
-            dict_key = f"{self.parent_app.current_year}-{self.parent_app.current_month}-{day}-{col_index}"
-            data_list = self.parent_app.data_manager.get_transaction_data(dict_key)
-            if data_list:
-                day_total = sum(parse_amount(row[1]) for row in data_list if len(row) > 1)
-                if day_total > 0:
-                    days_with_data.append(f"{day}日: ¥{day_total:,}")
-                    total += day_total
+        # 全日付を引かず、索引からこの列のデータがある日だけを日付順に取り出す
+        year = self.parent_app.current_year
+        month = self.parent_app.current_month
+        days = sorted(data_manager.get_column_days(year, month, col_index))
+        
+        for day in days:
+            if day == 0:
+                continue
+            day_total = get_amount_total((year, month, day, col_index))
+            if day_total > 0:
+                add_day(f"{day}日: ¥{day_total:,}")
+                total += day_total
         
         if days_with_data:
             lines = [f"【{column_name}の内訳】"]
@@ -160,29 +204,24 @@ class TreeviewTooltip:
     
     def _show_income_tooltip(self, event):
         """収入セルのツールチップを表示"""
-        dict_key = f"{self.parent_app.current_year}-{self.parent_app.current_month}-0-3"
-        data_list = self.parent_app.data_manager.get_transaction_data(dict_key)
+        dict_key = (self.parent_app.current_year, self.parent_app.current_month, 0, 3)
+        rows = self.parent_app.data_manager.get_normalized_rows(dict_key)
         
-        if not data_list:
+        if not rows:
             self._hide_tooltip()
             return
         
         lines = ["【収入の内訳】"]
+        append = lines.append
         total = 0
         
-        for row in data_list:
-            if len(row) >= 3:
-                source = str(row[0]).strip() if row[0] else "(未入力)"
-                amount = parse_amount(row[1])
-                detail = str(row[2]).strip() if row[2] else ""
-                
-                total += amount
-                line = f"• {source}: ¥{amount:,}"
-                if detail:
-                    line += f" ({detail})"
-                lines.append(line)
-        
-        if len(data_list) > 1:
+        for source, _, detail, _, amount in rows:
+            source = source or "(未入力)"
+            total += amount
+            append(f"• {source}: ¥{amount:,} ({detail})" if detail
+                   else f"• {source}: ¥{amount:,}")
+        
+        if len(rows) > 1:
             lines.append("─" * 30)
             lines.append(f"合計: ¥{total:,}")
         
@@ -191,24 +230,27 @@ class TreeviewTooltip:
     def _show_expense_tooltip(self, event):
         """支出合計のツールチップを表示"""
         lines = ["【支出の内訳】"]
+        append = lines.append
         all_columns = self.parent_app.get_all_columns()
         grand_total = 0
-        days_in_month = self.parent_app.get_days_in_month()
+        n_cols = len(all_columns)
+        data_manager = self.parent_app.data_manager
+        get_amount_total = data_manager.get_amount_total
         
-        for col_index in range(1, len(all_columns)):
-            column_total = 0
+        # 日×列の全組み合わせを引かず、表示中の月のキーだけを1回走査して列ごとに集計する
+        column_totals = [0] * n_cols
+        for dict_key in data_manager.get_month_keys(self.parent_app.current_year,
+                                                    self.parent_app.current_month):
+            day, col_index = dict_key[2], dict_key[3]
+            if day != 0 and 0 < col_index < n_cols:
+                column_totals[col_index] += get_amount_total(dict_key)
+        
+        for col_index in range(1, n_cols):
+            column_total = column_totals[col_index]
             column_name = all_columns[col_index]
             
-            for day in range(1, days_in_month + 1):
-                dict_key = f"{self.parent_app.current_year}-{self.parent_app.current_month}-{day}-{col_index}"
-                data_list = self.parent_app.data_manager.get_transaction_data(dict_key)
-                if data_list:
-                    for row in data_list:
-                        if len(row) > 1:
-                            column_total += parse_amount(row[1])
-            
             if column_total > 0:
-                lines.append(f"• {column_name}: ¥{column_total:,}")
+                append(f"• {column_name}: ¥{column_total:,}")
                 grand_total += column_total
         
         lines.append("─" * 30)
@@ -216,30 +258,38 @@ class TreeviewTooltip:
         self._show_tooltip(event, "\n".join(lines))
     
     def _show_tooltip(self, event, text):
-        """ツールチップウィンドウを表示する"""
-        self._hide_tooltip()
+        """
+        ツールチップウィンドウを表示する
         
-        self.tooltip_window = tk.Toplevel(self.treeview)
-        self.tooltip_window.wm_overrideredirect(True)
-        self.tooltip_window.wm_geometry(f"+{event.x_root + 10}+{event.y_root + 10}")
+        ウィンドウは初回に1つだけ作成し、以降は文字と位置を変えて再表示する。
+        """
+        if self.tooltip_window is None:
+            self.tooltip_window = tk.Toplevel(self.treeview)
+            self.tooltip_window.wm_overrideredirect(True)
+            
+            self.tooltip_label = tk.Label(self.tooltip_window,
+                                          justify=tk.LEFT,
+                                          background="#ffffcc",
+                                          relief=tk.SOLID,
+                                          borderwidth=1,
+                                          font=("Arial", 9))
+            self.tooltip_label.pack()
         
-        label = tk.Label(self.tooltip_window,
-                         text=text,
-                         justify=tk.LEFT,
-                         background="#ffffcc",
-                         relief=tk.SOLID,
-                         borderwidth=1,
-                         font=("Arial", 9))
-        label.pack()
+        self.tooltip_label.configure(text=text)
+        self.tooltip_window.wm_geometry(f"+{event.x_root + 10}+{event.y_root + 10}")
+        self.tooltip_window.deiconify()
+        self._tooltip_visible = True
     
     def _hide_tooltip(self):
-        """ツールチップを非表示にする"""
-        if self.tooltip_window:
-            self.tooltip_window.destroy()
-            self.tooltip_window = None
+        """ツールチップを非表示にする（ウィンドウは破棄せずに隠す）"""
+        self._cancel_pending()
+        if self._tooltip_visible:
+            self.tooltip_window.withdraw()
+            self._tooltip_visible = False
         self.current_item = None
         self.current_column = None
     
     def _on_mouse_leave(self, event):
         """マウスがTreeviewから離れた時の処理"""
+        self._pending_event = None
         self._hide_tooltip()
\ No newline at end of file
@@ -5,8 +5,10 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
 import json
+from bisect import bisect_left
+from collections import deque
 from ui.base_dialog import BaseDialog
-from config import DialogConfig, parse_amount
+from config import DialogConfig
 
 
 class TransactionDialog(BaseDialog):
@@ -18,20 +20,26 @@ class TransactionDialog(BaseDialog):
     支払先の入力時には過去の履歴から候補を表示する。
     """
     
-    def __init__(self, parent, parent_app, dict_key, col_name):
+    def __init__(self, parent, parent_app, dict_key, col_name, on_close=None):
         """
         取引詳細ダイアログを初期化する。
         
         Args:
             parent: 親ウィンドウ
             parent_app: メインアプリケーションのインスタンス
-            dict_key: データのキー(年-月-日-列インデックス)
+            dict_key: データのキー(年, 月, 日, 列インデックス)
             col_name: 項目名(表示用)
+            on_close: ダイアログが閉じた後に呼び出す関数(閉じた時点の取引データを渡す)
         """
         self.parent_app = parent_app
         self.dict_key = dict_key
         self.col_name = col_name
         self.entry_editor = None
+        self._on_close = on_close
+        
+        # ダイアログを開いている間はメイン画面のツールチップを止める
+        if parent_app.tooltip:
+            parent_app.tooltip.pause()
         
         # 自動補完用の変数
         self.autocomplete_candidates = []  # 現在の候補リスト
@@ -40,20 +48,18 @@ class TransactionDialog(BaseDialog):
         
         # メモ候補をキャッシュ（初期化時に1回だけ収集・効率化）
         self._memo_candidates_cache = None
+        # 前方一致検索用の索引（小文字化した文字列でソート済み、候補の変更時に破棄）
+        self._partner_prefix_index = None
+        self._memo_prefix_index = None
+        # 直前の候補検索の結果 (列インデックス, 小文字化した入力, 候補のリスト)
+        self._autocomplete_memo = None
         
         # 元に戻す機能用
-        self.undo_stack = []  # 操作履歴 [(action_type, data), ...]
         self.max_undo_count = 50  # 最大保持数
+        self.undo_stack = deque(maxlen=self.max_undo_count)  # 操作履歴（超過分は古いものから自動削除）
         
-        # キーを解析して年月日と列インデックスを取得
-        parts = dict_key.split("-")
-        if len(parts) == 4:
-            self.year = int(parts[0])
-            self.month = int(parts[1])
-            self.day = int(parts[2])
-            self.col_index = int(parts[3])
-        else:
-            self.year = self.month = self.day = self.col_index = 0
+        # キーから年月日と列インデックスを取得
+        self.year, self.month, self.day, self.col_index = dict_key
         
         super().__init__(parent, f"支出・収入詳細 - {col_name}",
                          DialogConfig.TRANSACTION_WIDTH,
@@ -61,6 +67,21 @@ class TransactionDialog(BaseDialog):
         
         self._create_widgets()
     
+    def destroy(self):
+        """
+        ダイアログを閉じる
+        
+        OK・Escape・ウィンドウの×ボタンのいずれで閉じた場合も、
+        破棄した後でon_closeを1回だけ呼び出す。
+        """
+        on_close = self._on_close
+        self._on_close = None
+        super().destroy()
+        if self.parent_app.tooltip:
+            self.parent_app.tooltip.resume()
+        if on_close is not None:
+            on_close(self.parent_app.data_manager.get_transaction_data(self.dict_key))
+    
     def _create_widgets(self):
         """取引詳細ダイアログのUI要素を作成する"""
         # グリッドレイアウトの設定
@@ -186,26 +207,20 @@ class TransactionDialog(BaseDialog):
     
     def _load_data(self):
         """既存のデータを読み込んでTreeviewに表示する"""
-        # 既存の表示をクリア
-        for item in self.tree.get_children():
-            self.tree.delete(item)
+        # 既存の表示は1回の呼び出しでまとめてクリア
+        self.tree.delete(*self.tree.get_children())
         
         # データを取得
         data_list = self.parent_app.data_manager.get_transaction_data(self.dict_key)
         
-        if not data_list:
-            # データがない場合は空行を1つ追加
-            self.tree.insert("", "end", values=["", "", ""])
-        else:
-            # 既存データを表示
-            for row in data_list:
-                row_data = list(row) if row else ["", "", ""]
-                while len(row_data) < 3:
-                    row_data.append("")
-                self.tree.insert("", "end", values=row_data)
-            
-            # 最後に空行を追加(新規入力用)
-            self.tree.insert("", "end", values=["", "", ""])
+        # 既存データを表示し、最後に空行を追加(新規入力用、データがない場合は空行のみ)
+        insert = self.tree.insert
+        for row in data_list:
+            row_data = list(row) if row else ["", "", ""]
+            while len(row_data) < 3:
+                row_data.append("")
+            insert("", "end", values=row_data)
+        insert("", "end", values=["", "", ""])
     
     def _add_row(self):
         """新しい空行を追加する"""
@@ -228,20 +243,52 @@ class TransactionDialog(BaseDialog):
         if not text:
             return []
         
-        text_lower = text.lower()
-        
         if col_idx == 0:  # 支払先列
             # 支払先の履歴から候補を取得
-            all_partners = self.parent_app.data_manager.get_transaction_partners_list()
-            candidates = [p for p in all_partners if p.lower().startswith(text_lower)]
+            if self._partner_prefix_index is None:
+                self._partner_prefix_index = self._build_prefix_index(
+                    self.parent_app.data_manager.get_transaction_partners_list())
+            index = self._partner_prefix_index
         elif col_idx == 2:  # メモ列
             # キャッシュされたメモ候補を使用（効率化）
-            all_memos = self._get_memo_candidates()
-            candidates = [m for m in all_memos if m.lower().startswith(text_lower)]
+            if self._memo_prefix_index is None:
+                self._memo_prefix_index = self._build_prefix_index(self._get_memo_candidates())
+            index = self._memo_prefix_index
         else:
-            candidates = []
+            return []
+        
+        text_lower = text.lower()
         
-        return sorted(candidates)
+        # 直前の入力を延長しただけの場合は、前回の候補を絞り込むだけで済む
+        memo = self._autocomplete_memo
+        if memo is not None and memo[0] == col_idx and text_lower.startswith(memo[1]):
+            candidates = [c for c in memo[2] if c.lower().startswith(text_lower)]
+        else:
+            # 前方一致する候補はソート済みの索引上で連続するため、開始位置を二分探索で求め、
+            # 一致しなくなるまで進めて終了位置とする（"\uffff"を番兵にすると絵文字などが漏れる）
+            # 索引の順序のまま返すため、候補は大文字小文字を区別しない順に並ぶ
+            lo = bisect_left(index, (text_lower,))
+            hi = lo
+            end = len(index)
+            while hi < end and index[hi][0].startswith(text_lower):
+                hi += 1
+            candidates = [value for _, value in index[lo:hi]]
+        
+        self._autocomplete_memo = (col_idx, text_lower, candidates)
+        return candidates
+    
+    @staticmethod
+    def _build_prefix_index(values):
+        """
+        前方一致検索用の索引を作成する
+        
+        Args:
+            values: 候補文字列のリスト
+            
+        Returns:
+            list: (小文字化した文字列, 元の文字列) のソート済みリスト
+        """
+        return sorted((value.lower(), value) for value in values)
     
     def _collect_all_memos(self):
         """全取引データからメモを収集する（初期化時に1回だけ実行・効率化）"""
@@ -258,6 +305,25 @@ class TransactionDialog(BaseDialog):
             self._memo_candidates_cache = self._collect_all_memos()
         return self._memo_candidates_cache
     
+    def _add_memo_candidate(self, memo):
+        """
+        入力されたメモを候補のキャッシュに追加する
+        
+        キャッシュ未作成の場合は、次回の収集時に含まれるため何もしない。
+        
+        Args:
+            memo: 追加するメモ
+        """
+        memos = self._memo_candidates_cache
+        if memos is None:
+            return
+        # ソート済みの順序を保ったまま、未登録の場合のみ挿入
+        pos = bisect_left(memos, memo)
+        if pos == len(memos) or memos[pos] != memo:
+            memos.insert(pos, memo)
+            self._memo_prefix_index = None
+            self._autocomplete_memo = None
+    
     def _handle_autocomplete_tab(self, event, item_id, col_idx):
         """
         TABキーによる自動補完を処理する
@@ -420,16 +486,18 @@ class TransactionDialog(BaseDialog):
                     'new_value': new_value
                 })
                 
-                if len(self.undo_stack) > self.max_undo_count:
-                    self.undo_stack.pop(0)
-                
                 # メインウィンドウにも保存（ダイアログを閉じた後用）
                 old_data = self.parent_app.data_manager.get_transaction_data(self.dict_key)
-                self.parent_app._save_undo_state('detail_edit', [(self.dict_key, old_data[:] if old_data else None)])
+                self.parent_app._save_undo_state('detail_edit', [(self.dict_key, old_data or None)])
             
             # 支払先の場合は履歴に追加
             if col_idx == 0 and new_value.strip():
                 self.parent_app.data_manager.add_transaction_partner(new_value.strip())
+                self._partner_prefix_index = None
+                self._autocomplete_memo = None
+            # メモの場合は収集済みの候補に追加（全データを再収集しない）
+            elif col_idx == 2 and new_value.strip():
+                self._add_memo_candidate(new_value.strip())
             
             # Treeviewの値を更新
             values = list(self.tree.item(item_id, 'values'))
@@ -597,10 +665,10 @@ class TransactionDialog(BaseDialog):
             
         if rows_data:
             # JSON形式でクリップボードにコピー
-            json_str = json.dumps(rows_data, ensure_ascii=False)
+            json_str = json.dumps(rows_data, ensure_ascii=False, separators=(',', ':'))
             self.clipboard_clear()
             self.clipboard_append(json_str)
-            self.update()
+            self.update_idletasks()
 
     def _paste_rows(self):
         """クリップボードから行を貼り付ける（メインウィンドウからの貼り付けもサポート）"""
@@ -612,9 +680,10 @@ class TransactionDialog(BaseDialog):
         new_data = []
         is_main_window_data = False
         
-        # JSON形式として解析
+        # JSON形式として解析（先頭が"["でなければ解析を試みない。Excel等の貼り付けで
+        # JSONの解析と例外処理を毎回行わないため）
         try:
-            parsed = json.loads(clipboard_text)
+            parsed = json.loads(clipboard_text) if clipboard_text.lstrip()[:1] == "[" else None
             if isinstance(parsed, list):
                 # メインウィンドウからのコピーデータかチェック
                 if parsed and isinstance(parsed[0], dict) and 'data' in parsed[0]:
@@ -634,8 +703,7 @@ class TransactionDialog(BaseDialog):
             
         # JSONでなければタブ区切りテキスト（Excel等）として解析
         if not new_data and clipboard_text:
-            lines = clipboard_text.strip().split('\n')
-            for line in lines:
+            for line in clipboard_text.strip().splitlines():
                 cols = line.split('\t')
                 # 少なくとも1つの列があれば採用
                 if cols:
@@ -647,8 +715,15 @@ class TransactionDialog(BaseDialog):
         # 元に戻す用に貼り付け前の状態を保存
         if new_data:
             undo_data = []
-            insert_count = 0
             
+            # 挿入位置は貼り付け前に1回だけ求める
+            # （末尾が完全な空行（入力用）ならその手前、そうでなければ末尾）
+            items = self.tree.get_children()
+            insert_index = len(items)
+            if items and all(v == "" for v in self.tree.item(items[-1], 'values')):
+                insert_index -= 1
+            
+            insert = self.tree.insert
             for row in new_data:
                 # [支払先, 金額, メモ] の形式であることを確認
                 if isinstance(row, list) and len(row) >= 2: # 少なくとも支払先と金額
@@ -656,23 +731,11 @@ class TransactionDialog(BaseDialog):
                     while len(safe_row) < 3:
                         safe_row.append("")
                     
-                    # 空行（入力用）の直前に挿入するのが理想的だが、末尾追加でOK
-                    # 現在の末尾の空行を探す
-                    items = self.tree.get_children()
-                    last_item = items[-1] if items else None
-                    last_vals = self.tree.item(last_item, 'values') if last_item else None
-                    
-                    # 末尾が完全な空行なら、その手前に挿入
-                    if last_vals and all(v == "" for v in last_vals):
-                        insert_index = items.index(last_item)
-                        self.tree.insert("", insert_index, values=safe_row)
-                    else:
-                        insert_index = len(items)
-                        self.tree.insert("", "end", values=safe_row)
+                    insert("", insert_index, values=safe_row)
                     
                     # 元に戻す用にインデックスを記録
-                    undo_data.append((insert_index + insert_count, safe_row))
-                    insert_count += 1
+                    undo_data.append((insert_index, safe_row))
+                    insert_index += 1
             
             # 元に戻すスタックに保存
             if undo_data:
@@ -715,41 +778,45 @@ class TransactionDialog(BaseDialog):
         }
         
         self.undo_stack.append(undo_entry)
-        
-        # 最大保持数を超えたら古いものから削除
-        if len(self.undo_stack) > self.max_undo_count:
-            self.undo_stack.pop(0)
 
-    def _apply_changes_to_parent(self):
+    def _collect_rows(self):
         """
-        現在のダイアログのデータをメインウィンドウに即座に反映
+        Treeviewの全行を取引データとして収集する
+        
+        子要素の一覧を1回だけ取得し、読み出しと空行の除去を1回の走査で行う。
+        
+        Returns:
+            list: 空行を除いた (支払先, 金額, 詳細) のタプルのリスト
         """
-        # すべての行データを収集
-        all_rows = []
+        item = self.tree.item
+        rows = []
         for item_id in self.tree.get_children():
-            values = self.tree.item(item_id, 'values')
-            row = list(values)
+            row = list(item(item_id, 'values'))
             while len(row) < 3:
                 row.append("")
-            all_rows.append(tuple(row))
-        
-        # 空行を除去
-        filtered_rows = [row for row in all_rows if any(str(cell).strip() for cell in row)]
+            if any(str(cell).strip() for cell in row):
+                rows.append(tuple(row))
+        return rows
+    
+    def _apply_changes_to_parent(self):
+        """
+        現在のダイアログのデータをメインウィンドウに即座に反映
+        """
+        # すべての行データを収集（空行は除去）
+        filtered_rows = self._collect_rows()
         
         if not filtered_rows:
             # データが空の場合
-            dict_key_day = f"{self.year}-{self.month}-{self.day}"
+            dict_key_day = (self.year, self.month, self.day)
             self.parent_app.update_parent_cell(dict_key_day, self.col_index, "")
             self.parent_app.data_manager.delete_transaction_data(self.dict_key)
         else:
             # データがある場合
-            self.parent_app.data_manager.set_transaction_data(self.dict_key, filtered_rows)
-            
-            # 金額列(インデックス1)を合計
-            total = sum(parse_amount(row[1]) for row in filtered_rows if len(row) > 1)
+            # 金額列(インデックス1)の合計はデータ設定時に計算される
+            total = self.parent_app.data_manager.set_transaction_data(self.dict_key, filtered_rows)
             
             # 親セルを更新
-            dict_key_day = f"{self.year}-{self.month}-{self.day}"
+            dict_key_day = (self.year, self.month, self.day)
             display_value = str(total) if total != 0 else ""
             self.parent_app.update_parent_cell(dict_key_day, self.col_index, display_value)
     
@@ -831,38 +898,27 @@ class TransactionDialog(BaseDialog):
         # 編集前のデータを保存（元に戻す用）
         old_data = self.parent_app.data_manager.get_transaction_data(self.dict_key)
         
-        # すべての行データを収集
-        all_rows = []
-        for item_id in self.tree.get_children():
-            values = self.tree.item(item_id, 'values')
-            row = list(values)
-            while len(row) < 3:
-                row.append("")
-            all_rows.append(tuple(row))
-        
-        # 空行を除去
-        filtered_rows = [row for row in all_rows if any(str(cell).strip() for cell in row)]
+        # すべての行データを収集（空行は除去）
+        filtered_rows = self._collect_rows()
         
         if not filtered_rows:
             # データが空の場合
-            dict_key_day = f"{self.year}-{self.month}-{self.day}"
+            dict_key_day = (self.year, self.month, self.day)
             self.parent_app.update_parent_cell(dict_key_day, self.col_index, "")
             self.parent_app.data_manager.delete_transaction_data(self.dict_key)
         else:
             # データがある場合
-            self.parent_app.data_manager.set_transaction_data(self.dict_key, filtered_rows)
-            
-            # 金額列(インデックス1)を合計
-            total = sum(parse_amount(row[1]) for row in filtered_rows if len(row) > 1)
+            # 金額列(インデックス1)の合計はデータ設定時に計算される
+            total = self.parent_app.data_manager.set_transaction_data(self.dict_key, filtered_rows)
             
             # 親セルを更新
-            dict_key_day = f"{self.year}-{self.month}-{self.day}"
+            dict_key_day = (self.year, self.month, self.day)
             display_value = str(total) if total != 0 else ""
             self.parent_app.update_parent_cell(dict_key_day, self.col_index, display_value)
         
         # データが変更されていればメインウィンドウの元に戻すスタックに保存
         new_data = self.parent_app.data_manager.get_transaction_data(self.dict_key)
         if old_data != new_data:
-            self.parent_app._save_undo_state('edit_detail', [(self.dict_key, old_data[:] if old_data else None)])
+            self.parent_app._save_undo_state('edit_detail', [(self.dict_key, old_data or None)])
         
         self.destroy()
\ No newline at end of file
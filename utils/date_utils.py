@@ -3,6 +3,12 @@
 日付関連のユーティリティ関数
 """
 
+# 曜日の表示名(datetime.date.weekday()の値でインデックス)
+WEEKDAY_NAMES = ("月", "火", "水", "木", "金", "土", "日")
+
+# 平年の各月の日数(月の値でインデックス、0は未使用)
+_DAYS_IN_MONTH = (0, 31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+
 
 def get_days_in_month(year, month):
     """
@@ -16,15 +22,16 @@ def get_days_in_month(year, month):
         
     Returns:
         int: その月の日数
+        
+    Raises:
+        ValueError: 月が1-12の範囲外の場合
     """
-    if month in [1, 3, 5, 7, 8, 10, 12]:
-        return 31
-    elif month in [4, 6, 9, 11]:
-        return 30
-    elif month == 2:
-        # うるう年の判定
-        return 29 if (year % 4 == 0 and year % 100 != 0) or (year % 400 == 0) else 28
-    return 30
+    if not 1 <= month <= 12:
+        raise ValueError(f"月は1-12で指定してください: {month}")
+    if month == 2:
+        # うるう年の判定(is_leap_year と同じ式をインライン展開)
+        return 29 if (year & 3) == 0 and (year % 25 != 0 or (year & 15) == 0) else 28
+    return _DAYS_IN_MONTH[month]
 
 
 def is_leap_year(year):
@@ -37,4 +44,7 @@ def is_leap_year(year):
     Returns:
         bool: うるう年の場合True
     """
-    return (year % 4 == 0 and year % 100 != 0) or (year % 400 == 0)
\ No newline at end of file
+    # 4の倍数かつ(100の倍数でない または 400の倍数)。
+    # 4の倍数である年では「100の倍数」は「25の倍数」、「400の倍数」は「16の倍数」と同値なので、
+    # 4と16の剰余をビット演算で求める
+    return (year & 3) == 0 and (year % 25 != 0 or (year & 15) == 0)
\ No newline at end of file
@@ -2,13 +2,10 @@
 """
 フォント設定ユーティリティ
 """
-import matplotlib.pyplot as plt
-import matplotlib.font_manager as fm
-import warnings
 from config import FontConfig
 
-# matplotlibのフォント警告を抑制
-warnings.filterwarnings('ignore', category=UserWarning, module='matplotlib.font_manager')
+# 選択済みのフォント名（フォント一覧の走査は最初の呼び出しで1回だけ行う）
+_selected_font = None
 
 
 def setup_japanese_font():
@@ -18,19 +15,38 @@ def setup_japanese_font():
     Windowsシステムに存在する日本語フォントを優先順位順に検索し、
     最初に見つかったフォントをmatplotlibのデフォルトフォントとして設定する。
     日本語フォントが見つからない場合は、DejaVu Sansを使用する。
+    
+    検索結果は保持し、2回目以降の呼び出しではフォント一覧を走査せずに設定のみ行う。
+    """
+    # matplotlibはグラフ表示時まで読み込まない（起動時間の短縮）
+    import matplotlib.pyplot as plt
+    
+    global _selected_font
+    if _selected_font is None:
+        _selected_font = _find_japanese_font()
+    plt.rcParams['font.family'] = _selected_font
+
+
+def _find_japanese_font():
     """
+    利用可能な日本語フォントを優先順位順に検索する。
+    
+    Returns:
+        str: 見つかったフォント名(見つからない場合やエラー時はフォールバックフォント)
+    """
+    import matplotlib.font_manager as fm
+    
     try:
-        # システムにインストールされている全フォントのリストを取得
-        available_fonts = [f.name for f in fm.fontManager.ttflist]
+        # システムにインストールされている全フォント名の集合を取得
+        available_fonts = {f.name for f in fm.fontManager.ttflist}
         
         # 利用可能な日本語フォントを検索
         for font in FontConfig.JAPANESE_FONTS:
             if font in available_fonts:
-                plt.rcParams['font.family'] = font
-                return
-        
-        # 日本語フォントが見つからない場合のフォールバック
-        plt.rcParams['font.family'] = FontConfig.FALLBACK_FONT
+                return font
     except Exception:
         # エラーが発生した場合もフォールバック
-        plt.rcParams['font.family'] = FontConfig.FALLBACK_FONT
\ No newline at end of file
+        pass
+    
+    # 日本語フォントが見つからない場合のフォールバック
+    return FontConfig.FALLBACK_FONT
\ No newline at end of file